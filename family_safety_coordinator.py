@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+# cython: language_level=3
 """
 Family Safety Coordinator
 Unified system coordinating child and maternal protection services.
@@ -10,6 +11,51 @@ from typing import Dict, List, Optional
 from child_protection import ChildProtectionSystem
 from maternal_health import MaternalHealthSystem
 
+# Base recommendations by coordination level, built once at import
+BASE_RECOMMENDATIONS: Dict[str, List[str]] = {
+    "CRITICAL_FAMILY": [
+        "Immediate multi-agency family intervention",
+        "Emergency family shelter coordination",
+        "Comprehensive family assessment by CPS and health services",
+        "Legal protection orders for all family members",
+        "Crisis counseling for entire family unit"
+    ],
+    "HIGH_PRIORITY": [
+        "Coordinated child and maternal health services",
+        "Family counseling and support services",
+        "Integrated case management",
+        "Regular family wellness check-ins",
+        "Community resource coordination"
+    ],
+    "ELEVATED_CONCERN": [
+        "Family support program enrollment",
+        "Preventive health and safety education",
+        "Community resource connection",
+        "Regular monitoring and follow-up",
+        "Family strengthening programs"
+    ],
+    "STANDARD": [
+        "General family wellness resources",
+        "Preventive education programs",
+        "Community support network connection",
+        "Regular health screenings",
+        "Positive parenting resources"
+    ]
+}
+
+def _aggregate_indicators(members: List[Dict]) -> Dict[str, bool]:
+    """OR-merge boolean indicators across family members"""
+    aggregated: Dict[str, bool] = {}
+
+    for member in members:
+        for key, value in member.get("indicators", {}).items():
+            if value:
+                aggregated[key] = True
+            elif key not in aggregated:
+                aggregated[key] = False
+
+    return aggregated
+
 class FamilySafetyCoordinator:
     """Unified family safety coordination system"""
 
@@ -70,53 +116,36 @@ class FamilySafetyCoordinator:
             )
         }
 
-    def _aggregate_child_indicators(self, children: List[Dict]) -> Dict:
+    def _aggregate_child_indicators(self, children: List[Dict]) -> Dict[str, bool]:
         """Aggregate child safety indicators across all children"""
-        aggregated = {}
-
-        for child in children:
-            indicators = child.get("indicators", {})
-            for key, value in indicators.items():
-                if key not in aggregated:
-                    aggregated[key] = False
-                if value:
-                    aggregated[key] = True
-
-        return aggregated
+        return _aggregate_indicators(children)
 
-    def _aggregate_maternal_indicators(self, mothers: List[Dict]) -> Dict:
+    def _aggregate_maternal_indicators(self, mothers: List[Dict]) -> Dict[str, bool]:
         """Aggregate maternal health indicators"""
-        aggregated = {}
-
-        for mother in mothers:
-            indicators = mother.get("indicators", {})
-            for key, value in indicators.items():
-                if key not in aggregated:
-                    aggregated[key] = False
-                if value:
-                    aggregated[key] = True
-
-        return aggregated
+        return _aggregate_indicators(mothers)
 
     def _calculate_family_risk(self, child_assessment: Optional[Dict],
                              maternal_assessment: Optional[Dict]) -> float:
         """Calculate overall family risk score"""
-        risk_scores = []
+        total: float = 0.0
+        count: int = 0
 
         if child_assessment:
-            risk_scores.append(child_assessment["risk_score"])
+            total += child_assessment["risk_score"]
+            count += 1
 
         if maternal_assessment:
-            risk_scores.append(maternal_assessment["risk_score"])
+            total += maternal_assessment["risk_score"]
+            count += 1
 
-        if not risk_scores:
+        if count == 0:
             return 0.0
 
         # Average risk scores with weighting
-        avg_risk = sum(risk_scores) / len(risk_scores)
+        avg_risk: float = total / count
 
         # Add family system interaction factor
-        interaction_factor = 0.1 if len(risk_scores) > 1 else 0.0
+        interaction_factor: float = 0.1 if count > 1 else 0.0
 
         return min(1.0, avg_risk + interaction_factor)
 
@@ -124,41 +153,9 @@ class FamilySafetyCoordinator:
                                          maternal_assessment: Optional[Dict],
                                          level: str) -> List[str]:
         """Create integrated family safety recommendations"""
-        recommendations = []
-
-        # Base recommendations by coordination level
-        base_recs = {
-            "CRITICAL_FAMILY": [
-                "Immediate multi-agency family intervention",
-                "Emergency family shelter coordination",
-                "Comprehensive family assessment by CPS and health services",
-                "Legal protection orders for all family members",
-                "Crisis counseling for entire family unit"
-            ],
-            "HIGH_PRIORITY": [
-                "Coordinated child and maternal health services",
-                "Family counseling and support services",
-                "Integrated case management",
-                "Regular family wellness check-ins",
-                "Community resource coordination"
-            ],
-            "ELEVATED_CONCERN": [
-                "Family support program enrollment",
-                "Preventive health and safety education",
-                "Community resource connection",
-                "Regular monitoring and follow-up",
-                "Family strengthening programs"
-            ],
-            "STANDARD": [
-                "General family wellness resources",
-                "Preventive education programs",
-                "Community support network connection",
-                "Regular health screenings",
-                "Positive parenting resources"
-            ]
-        }
+        recommendations: List[str] = []
 
-        recommendations.extend(base_recs.get(level, []))
+        recommendations.extend(BASE_RECOMMENDATIONS.get(level, []))
 
         # Add specific subsystem recommendations
         if child_assessment:
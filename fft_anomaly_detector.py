@@ -3,11 +3,55 @@
 # pip install numpy requests
 
 import time
+import queue
+import atexit
+import logging
+import logging.handlers
 import threading
 import collections
 import numpy as np
 import requests
 
+# Alerts are handed to a queue and written out by a background listener so
+# the analysis thread never blocks on stdout. The listener runs only while
+# at least one detector is running.
+_log_queue = queue.Queue(-1)
+_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_listener_lock = threading.Lock()
+_listener_users = 0
+
+logger = logging.getLogger("fft")
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+def _acquire_listener():
+    """Start the log listener for the first running detector"""
+    global _listener_users
+    with _listener_lock:
+        if _listener_users == 0:
+            _listener.start()
+        _listener_users += 1
+
+def _release_listener():
+    """Stop the log listener, flushing queued alerts, once no detector runs"""
+    global _listener_users
+    with _listener_lock:
+        if _listener_users == 0:
+            return
+        _listener_users -= 1
+        if _listener_users == 0:
+            _listener.stop()
+
+@atexit.register
+def _stop_listener():
+    """Flush and stop the listener at exit if detectors were never stopped"""
+    global _listener_users
+    with _listener_lock:
+        if _listener_users:
+            _listener_users = 0
+            _listener.stop()
+
 class NodeRingBuffer:
     def __init__(self, length=256):
         self.buf = collections.deque(maxlen=length)
@@ -35,6 +79,7 @@ class FFTAnomalyDetector:
         self.window = window
         self.buffers = {}  # node_id -> NodeRingBuffer
         self._stop = threading.Event()
+        _acquire_listener()
         self._t = threading.Thread(target=self._run_loop, daemon=True)
         self._t.start()
 
@@ -66,14 +111,24 @@ class FFTAnomalyDetector:
         return False
 
     def _alert(self, payload):
-        print("[FFT ALERT]", payload)
+        logger.info("FFT ALERT node=%s f=%.3f m=%.3f t=%.3f",
+                    payload["node_id"], payload["peak_frequency"], payload["peak_magnitude"],
+                    payload["timestamp"])
         if self.webhook_url:
             try:
                 requests.post(self.webhook_url, json=payload, timeout=1.0)
             except Exception as e:
-                print("[WebhookError]", e)
+                logger.warning("Webhook error: %s", e)
 
     def _run_loop(self):
+        try:
+            self._poll_loop()
+        finally:
+            # Released by the loop itself so alerts it logs while stop() waits
+            # are still flushed; a loop that never ends is left to the atexit hook
+            _release_listener()
+
+    def _poll_loop(self):
         while not self._stop.is_set():
             # snapshot telemetry source
             metrics = self.telemetry_client()  # expected: dict node_id -> metric dict
@@ -101,6 +156,8 @@ class FFTAnomalyDetector:
             time.sleep(1.0)
 
     def stop(self):
+        if self._stop.is_set():
+            return
         self._stop.set()
         self._t.join(timeout=2.0)
 
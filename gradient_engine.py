@@ -1,9 +1,12 @@
 import asyncio
-import json
+import hmac
 import time
 import random
 from typing import Dict, List, Optional
-from shared.protocol_breath import BreathNode, ResonantPacket
+import numpy as np
+from shared.protocol_breath import BreathNode, ResonantPacket, SEAL_ALGORITHMS, decode_json
+
+RISK_DOMAINS = ('climate', 'nuclear', 'pandemic', 'ai_alignment', 'geopolitical')
 
 class RiskGradientEngine:
     """
@@ -13,62 +16,97 @@ class RiskGradientEngine:
 
     def __init__(self, node_id: str):
         self.node_id = node_id
-        self.risk_domains = {
-            'climate': {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0},
-            'nuclear': {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0},
-            'pandemic': {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0},
-            'ai_alignment': {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0},
-            'geopolitical': {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0}
-        }
+        # Risk state kept as parallel arrays indexed by domain
+        self._domain_idx = {domain: i for i, domain in enumerate(RISK_DOMAINS)}
+        self._current = np.zeros(len(RISK_DOMAINS))
+        self._velocity = np.zeros(len(RISK_DOMAINS))
+        self._acceleration = np.zeros(len(RISK_DOMAINS))
         self.peer_gradients: Dict[str, Dict] = {}
+        # (peers x domains) matrix of peer 'current' values, NaN where unreported;
+        # _peer_rows maps each peer id to its row
+        self._peer_matrix = np.empty((0, len(RISK_DOMAINS)))
+        self._peer_rows: Dict[str, int] = {}
+        self._cached_coherence: Optional[float] = None
         self.forecast_horizon = 24  # hours
         self.last_update = time.time()
 
+    @property
+    def risk_domains(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-domain snapshot of the risk arrays (JSON-compatible).
+        Read-only: a new dict is built on each access, so writes to it are
+        not stored. Use update_risk_data to change risk levels.
+        """
+        return {
+            domain: {'current': c, 'velocity': v, 'acceleration': a}
+            for domain, c, v, a in zip(self._domain_idx,
+                                       self._current.tolist(),
+                                       self._velocity.tolist(),
+                                       self._acceleration.tolist())
+        }
+
+    def current_risk(self) -> Dict[str, float]:
+        """Current risk level per domain"""
+        return dict(zip(self._domain_idx, self._current.tolist()))
+
     def update_risk_data(self, domain: str, new_value: float):
         """Update risk level and calculate derivatives"""
-        if domain not in self.risk_domains:
+        i = self._domain_idx.get(domain)
+        if i is None:
             return
 
         current_time = time.time()
         dt = current_time - self.last_update
 
         if dt > 0:
-            old_velocity = self.risk_domains[domain]['velocity']
-            self.risk_domains[domain]['velocity'] = (new_value - self.risk_domains[domain]['current']) / dt
-            self.risk_domains[domain]['acceleration'] = (self.risk_domains[domain]['velocity'] - old_velocity) / dt
+            old_velocity = self._velocity[i]
+            self._velocity[i] = (new_value - self._current[i]) / dt
+            self._acceleration[i] = (self._velocity[i] - old_velocity) / dt
 
-        self.risk_domains[domain]['current'] = new_value
+        self._current[i] = new_value
         self.last_update = current_time
+        self._cached_coherence = None
 
     def harmonize_with_peers(self, peer_data: Dict[str, Dict]):
         """Integrate peer gradients for consensus calculation"""
         self.peer_gradients.update(peer_data)
+        self._cached_coherence = None
 
         # Calculate consensus gradient
-        consensus = {}
-        for domain in self.risk_domains:
-            peer_values = [peer_data.get(peer, {}).get(domain, {}).get('current', 0.0)
-                          for peer in peer_data.keys()]
-            if peer_values:
-                consensus[domain] = sum(peer_values) / len(peer_values)
+        if not peer_data:
+            return self.current_risk()
+
+        # Overwrite the rows of known peers, append rows for new ones
+        values = self._stack_peer_values(peer_data.values())
+        new_rows = []
+        for peer_id, row in zip(peer_data, values):
+            i = self._peer_rows.get(peer_id)
+            if i is None:
+                self._peer_rows[peer_id] = len(self._peer_matrix) + len(new_rows)
+                new_rows.append(row)
             else:
-                consensus[domain] = self.risk_domains[domain]['current']
+                self._peer_matrix[i] = row
+        if new_rows:
+            self._peer_matrix = np.vstack([self._peer_matrix, new_rows])
 
-        return consensus
+        peer_values = np.nan_to_num(values, nan=0.0)
+        return dict(zip(self._domain_idx, peer_values.mean(axis=0).tolist()))
+
+    def _stack_peer_values(self, peers) -> np.ndarray:
+        """Stack peer 'current' values into a (peers x domains) matrix"""
+        return np.array([[peer.get(domain, {}).get('current', np.nan)
+                          for domain in self._domain_idx]
+                         for peer in peers], dtype=float).reshape(-1, len(self._domain_idx))
 
     def forecast_risk(self, hours_ahead: int = 24) -> Dict[str, float]:
         """Project risk levels using second derivative analysis"""
-        forecast = {}
         dt = hours_ahead * 3600  # convert to seconds
 
-        for domain, data in self.risk_domains.items():
-            # Simple kinematic projection: x = x0 + v*t + 0.5*a*t^2
-            projected = (data['current'] +
-                        data['velocity'] * dt +
-                        0.5 * data['acceleration'] * dt * dt)
-            forecast[domain] = max(0.0, min(1.0, projected))  # Clamp to [0,1]
-
-        return forecast
+        # Simple kinematic projection: x = x0 + v*t + 0.5*a*t^2, clamped to [0,1]
+        projected = (self._current +
+                     self._velocity * dt +
+                     0.5 * self._acceleration * dt * dt)
+        return dict(zip(self._domain_idx, np.clip(projected, 0.0, 1.0).tolist()))
 
     def generate_gradient_payload(self) -> Dict:
         """Create payload for exhalation to mesh"""
@@ -83,23 +121,19 @@ class RiskGradientEngine:
 
     def calculate_coherence(self) -> float:
         """Measure mesh harmonization level"""
+        if self._cached_coherence is not None:
+            return self._cached_coherence
+
         if not self.peer_gradients:
             return 1.0
 
-        total_variance = 0.0
-        count = 0
-
-        for domain in self.risk_domains:
-            local_value = self.risk_domains[domain]['current']
-            peer_values = [self.peer_gradients[peer].get(domain, {}).get('current', local_value)
-                          for peer in self.peer_gradients]
-
-            if peer_values:
-                variance = sum((v - local_value) ** 2 for v in peer_values) / len(peer_values)
-                total_variance += variance
-                count += 1
+        # Unreported peer values fall back to the local value (zero deviation)
+        peers = self._peer_matrix
+        deviation = np.where(np.isnan(peers), 0.0, peers - self._current)
+        total_variance = float((deviation ** 2).mean())
 
-        return 1.0 / (1.0 + total_variance / count) if count > 0 else 1.0
+        self._cached_coherence = 1.0 / (1.0 + total_variance)
+        return self._cached_coherence
 
 class GradientGuardian(BreathNode):
     """Guardian Node that runs the Risk Gradient Engine"""
@@ -108,11 +142,15 @@ class GradientGuardian(BreathNode):
         super().__init__(node_id)
         self.engine = RiskGradientEngine(node_id)
         self.breath_interval = 60  # seconds
+        self._integrity_root_bytes = self.integrity_root.encode()
+        self.ingress_batch_size = 100
+        self._ingress_q: Optional[asyncio.Queue] = None
+        self._ingress_task: Optional[asyncio.Task] = None
 
     async def process_inhaled_packet(self, packet: Dict):
         """Process incoming peer data and update engine"""
         try:
-            content = json.loads(packet['content'])
+            content = decode_json(packet['content'])
             peer_data = content['data']
 
             if 'gradients' in peer_data:
@@ -123,61 +161,98 @@ class GradientGuardian(BreathNode):
             print(f"[GRADIENT_ERROR] Failed to process packet: {e}")
 
     async def inhale(self, reader, writer):
-        """Override to integrate gradient processing"""
+        """Override to queue inbound packets for batched verification"""
         data = await reader.read(4096)
-        message = data.decode()
         addr = writer.get_extra_info('peername')
+        writer.close()
+        await self._ingress_q.put((data, addr))
+
+    async def _ingress_worker(self):
+        """Verify and process queued packets in batches"""
+        while True:
+            batch = [await self._ingress_q.get()]
+            while len(batch) < self.ingress_batch_size and not self._ingress_q.empty():
+                batch.append(self._ingress_q.get_nowait())
 
+            verified = [packet for packet in (self._verify_packet(data, addr) for data, addr in batch)
+                        if packet is not None]
+            await asyncio.gather(*(self.process_inhaled_packet(packet) for packet in verified))
+
+    def _verify_packet(self, data: bytes, addr) -> Optional[Dict]:
+        """Parse a raw packet and check its seal; returns None if rejected"""
         try:
-            packet = json.loads(message)
+            packet = decode_json(data)
             print(f"[INHALATION] Signal received from {addr}")
 
             # Verify seal
+            seal_alg = packet.get('seal_alg', 'sha256')
+            if seal_alg not in SEAL_ALGORITHMS:
+                print(f"[SEAL_BREACH] Unsupported seal algorithm '{seal_alg}' from {addr}")
+                return None
+
             content = packet['content']
-            expected_seal = hashlib.sha256((content + self.integrity_root).encode()).hexdigest()
+            content_bytes = content.encode() if isinstance(content, str) else content
+            h = SEAL_ALGORITHMS[seal_alg]()
+            h.update(content_bytes)
+            h.update(self._integrity_root_bytes)
+            expected_seal = h.hexdigest()
 
-            if packet['seal'] == expected_seal:
-                await self.process_inhaled_packet(packet)
-            else:
-                print(f"[SEAL_BREACH] Invalid signature from {addr}")
+            if hmac.compare_digest(packet['seal'], expected_seal):
+                return packet
+            print(f"[SEAL_BREACH] Invalid signature from {addr}")
 
         except Exception as e:
             print(f"[ENTROPY] Rejected noisy signal from {addr}: {e}")
 
-        writer.close()
+        return None
 
     async def breath_cycle(self):
         """Continuous breathing cycle"""
         while True:
             # Simulate risk data updates (in real deployment, this would come from sensors/APIs)
-            for domain in self.engine.risk_domains:
+            for domain, current in self.engine.current_risk().items():
                 # Add some realistic noise and trends
                 noise = random.uniform(-0.05, 0.05)
                 trend = random.uniform(-0.01, 0.01)
-                new_value = self.engine.risk_domains[domain]['current'] + noise + trend
+                new_value = current + noise + trend
                 self.engine.update_risk_data(domain, max(0.0, min(1.0, new_value)))
 
             # Generate and exhale payload
             payload = self.engine.generate_gradient_payload()
 
             # Broadcast to known peers
-            for peer_host, peer_port in self.peers.copy():
-                await self.exhale(peer_host, peer_port, payload)
+            await self.broadcast(payload)
 
-            print(f"[GRADIENT] Coherence: {self.engine.calculate_coherence():.3f} | Forecast: {self.engine.forecast_risk(24)}")
+            print(f"[GRADIENT] Coherence: {payload['coherence_score']:.3f} | Forecast: {payload['forecast_24h']}")
 
             await asyncio.sleep(self.breath_interval)
 
     async def start(self):
         """Start the guardian with breathing cycle"""
-        # Start the breathing cycle
+        # Start the breathing cycle and the inbound packet worker
+        self._ingress_q = asyncio.Queue(maxsize=10 * self.ingress_batch_size)
+        self._ingress_task = asyncio.create_task(self._ingress_worker())
         asyncio.create_task(self.breath_cycle())
 
         # Start the server
-        server = await asyncio.start_server(self.inhale, self.host, self.port)
-        print(f"[*] ZFIRE Gradient Guardian {self.node_id} active on {self.host}:{self.port}")
-        async with server:
-            await server.serve_forever()
+        try:
+            server = await asyncio.start_server(self.inhale, self.host, self.port)
+            print(f"[*] ZFIRE Gradient Guardian {self.node_id} active on {self.host}:{self.port}")
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self._stop_ingress_worker()
+
+    async def _stop_ingress_worker(self):
+        """Cancel the ingress worker and surface any error it stopped with"""
+        task, self._ingress_task = self._ingress_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 # Initialize with some known peers for demo
 if __name__ == "__main__":
@@ -17,20 +17,33 @@ class AgentMemory:
     max_tokens: int = 100000
     current_tokens: int = 0
     messages: deque = field(default_factory=lambda: deque(maxlen=1000))
+    # Preformatted context lines and token estimates, parallel to `messages`
+    _context_parts: deque = field(default_factory=deque, init=False, repr=False)
+    _token_counts: deque = field(default_factory=deque, init=False, repr=False)
+    _context: Optional[str] = field(default=None, init=False, repr=False)
 
     def add_message(self, message: Message):
         # Rough token estimation (1 token ≈ 4 characters)
         token_estimate = len(message.content) // 4 + 1
-        if self.current_tokens + token_estimate > self.max_tokens:
-            # Remove oldest messages until we have space
-            while self.messages and self.current_tokens + token_estimate > self.max_tokens:
-                removed = self.messages.popleft()
-                self.current_tokens -= len(removed.content) // 4 + 1
+        # Remove oldest messages until we have space (or a free slot)
+        while self.messages and (self.current_tokens + token_estimate > self.max_tokens
+                                 or len(self.messages) == self.messages.maxlen):
+            self._evict_oldest()
         self.messages.append(message)
+        self._context_parts.append(f"{message.sender}: {message.content}")
+        self._token_counts.append(token_estimate)
         self.current_tokens += token_estimate
+        self._context = None
+
+    def _evict_oldest(self):
+        self.messages.popleft()
+        self._context_parts.popleft()
+        self.current_tokens -= self._token_counts.popleft()
 
     def get_context(self) -> str:
-        return "\n".join([f"{msg.sender}: {msg.content}" for msg in self.messages])
+        if self._context is None:
+            self._context = "\n".join(self._context_parts)
+        return self._context
 
 class Grok5Agent:
     def __init__(self, agent_id: str, max_memory_tokens: int = 100000):
@@ -39,6 +52,8 @@ class Grok5Agent:
         self.message_queue = asyncio.Queue()
         self.is_active = True
         self.task_count = 0
+        self.heartbeat_interval = 0.5
+        self._tasks: List[asyncio.Task] = []
 
     async def send_message(self, recipient: 'Grok5Agent', content: str, metadata: Dict[str, Any] = None):
         message = Message(
@@ -49,7 +64,7 @@ class Grok5Agent:
         await recipient.receive_message(message)
 
     async def receive_message(self, message: Message):
-        await self.message_queue.put(message)
+        self.message_queue.put_nowait(message)
         self.memory.add_message(message)
 
     async def process_task(self, task: str) -> str:
@@ -66,25 +81,36 @@ class Grok5Agent:
         return response
 
     async def run(self):
+        self._tasks = [
+            asyncio.ensure_future(self._dispatch()),
+            asyncio.ensure_future(self._periodic())
+        ]
+        try:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+
+    async def _dispatch(self):
         while self.is_active:
+            # Block until a message arrives; no polling
+            message = await self.message_queue.get()
             try:
-                # Check for messages
-                if not self.message_queue.empty():
-                    message = await asyncio.wait_for(self.message_queue.get(), timeout=0.1)
-                    # Process message (could trigger actions)
-                    print(f"{self.agent_id} received: {message.content[:50]}...")
-
-                # Simulate periodic activity
-                await asyncio.sleep(0.5)
-
-            except asyncio.TimeoutError:
-                continue
+                # Process message (could trigger actions)
+                print(f"{self.agent_id} received: {message.content[:50]}...")
             except Exception as e:
                 print(f"Agent {self.agent_id} error: {e}")
                 break
 
+    async def _periodic(self):
+        while self.is_active:
+            # Simulate periodic activity
+            await asyncio.sleep(self.heartbeat_interval)
+
     def stop(self):
         self.is_active = False
+        for task in self._tasks:
+            task.cancel()
 
     def get_stats(self) -> Dict[str, Any]:
         return {
@@ -13,13 +13,140 @@ import os
 import json
 import asyncio
 import hashlib
+import re
+import ssl
+import time
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Ledger hash constructors by name; each event records the one it used.
+# OpenSSL-backed SHA-256 on every host; BLAKE3 (SIMD) is opt-in by setting
+# ledger_hash, so installing blake3 does not change how ledgers are written.
+LEDGER_HASHES = {'sha256': hashlib.sha256}
+if blake3 is not None:
+    LEDGER_HASHES['blake3'] = blake3
+DEFAULT_LEDGER_HASH = 'sha256'
+
 logger = logging.getLogger(__name__)
 
+def _dumps_bytes(obj, sort_keys: bool = False) -> bytes:
+    """
+    Compact JSON bytes for writing ledger lines, via orjson when installed.
+    Not for hashing: number spelling differs between encoders (1e-7 vs 1e-07).
+    """
+    if orjson is not None:
+        # Non-str keys are written the way json does ("1", "true", "null")
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'),
+                      ensure_ascii=False).encode()
+
+def _dumps(obj, sort_keys: bool = False) -> str:
+    return _dumps_bytes(obj, sort_keys).decode()
+
+def _canonical_bytes(obj) -> bytes:
+    """Compact stdlib JSON of a scalar; the only encoding that feeds event hashes"""
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+def _json_key(key) -> str:
+    """Object key as json writes it; keys are sorted in this form"""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f'keys must be str, int, float, bool or None, not {type(key).__name__}')
+
+def _hash_canonical(h, obj):
+    """
+    Feed the compact sorted-key stdlib JSON of obj into hash h piece by piece.
+    Always the stdlib encoder, so hashes don't depend on whether orjson is installed.
+    """
+    if isinstance(obj, dict):
+        # Keys are stringified before sorting, so int/mixed keys hash the same
+        # as the string-keyed dict read back from the ledger
+        items = sorted(((_json_key(key), value) for key, value in obj.items()),
+                       key=lambda item: item[0])
+        h.update(b'{')
+        for i, (key, value) in enumerate(items):
+            if i:
+                h.update(b',')
+            h.update(_canonical_bytes(key))
+            h.update(b':')
+            _hash_canonical(h, value)
+        h.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'[')
+        for i, item in enumerate(obj):
+            if i:
+                h.update(b',')
+            _hash_canonical(h, item)
+        h.update(b']')
+    else:
+        h.update(_canonical_bytes(obj))
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _tail_lines(path: Path, n: int, block_size: int = 64 * 1024) -> List[bytes]:
+    """Last n non-empty lines of a file, reading backwards from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        while pos > 0 and (n <= 0 or data.count(b'\n') <= n):
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    lines = [line for line in data.split(b'\n') if line.strip()]
+    return lines[-n:] if n > 0 else lines
+
+@lru_cache(maxsize=None)
+def _scan_database(terms: tuple):
+    """Caseless Hyperscan database for terms, compiled once per term tuple"""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(term).encode() for term in terms],
+        ids=list(range(len(terms))),
+        elements=len(terms),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(terms)
+    )
+    return db
+
 class GuardrailsSystem:
     def __init__(self, swarm_core):
         self.swarm = swarm_core
@@ -27,6 +154,29 @@ class GuardrailsSystem:
         self.fail_safe_dir = Path('.swarm/fail_safe')
         self.fail_safe_dir.mkdir(exist_ok=True)
 
+        # Ledger lines are buffered and written in batches through one
+        # append-mode handle; each event chains to the previous event's hash.
+        self.ledger_batch_size = 64
+        self.ledger_hash = DEFAULT_LEDGER_HASH
+        self._ledger_buffer: List[str] = []
+        self._ledger_fp = None
+        self._ledger_writer_active = False
+        self._prev_hash: Optional[str] = None
+
+        # Git status probe, cached so back-to-back health checks share one scan
+        self.git_status_ttl = 5.0
+        self._git_repo = None
+        self._git_status_cache = (float('-inf'), False)
+
+        # Health results shared by the daemon, resurrection and other callers
+        self.health_check_ttl = 5.0
+        self._health_cache = (float('-inf'), False)
+
+        # Wakes the fail-safe waits early (shutdown or manual resurrection);
+        # created lazily so it binds to the running event loop
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
         self.opt_out_footer = """
         ---
         This is an automated message from the Resonance Swarm.
@@ -47,45 +197,128 @@ class GuardrailsSystem:
             'wellness': 'coherence'
         }
 
+        self._compile_health_terms()
+
+    def _compile_health_terms(self):
+        """Build the health term matchers; rerun after changing metaphor_only_language"""
+        # One case-insensitive pass finds every health term in any casing;
+        # longest first, so a term beats a shorter term it starts with
+        self._health_terms_re = re.compile(
+            '|'.join(re.escape(term) for term in
+                     sorted(self.metaphor_only_language, key=len, reverse=True)),
+            re.IGNORECASE
+        )
+        self._health_terms = tuple(self.metaphor_only_language)
+        self._health_terms_db = _scan_database(self._health_terms)
+
     def sanitize_content(self, content: str) -> str:
         """Strip all health language to pure metaphor"""
-        sanitized = content
-        for health_term, metaphor in self.metaphor_only_language.items():
-            sanitized = sanitized.replace(health_term, metaphor)
-            sanitized = sanitized.replace(health_term.capitalize(), metaphor.capitalize())
+        return self._health_terms_re.sub(self._metaphor_for, content)
+
+    def _metaphor_for(self, match) -> str:
+        """Metaphor for a matched health term, following the term's casing"""
+        term = match.group(0)
+        metaphor = self.metaphor_only_language[term.lower()]
+        if term.isupper() and len(term) > 1:
+            return metaphor.upper()
+        if term[0].isupper():
+            return metaphor.capitalize()
+        return metaphor
+
+    def _scan_health_terms(self, content: str) -> set:
+        """Set of (lowercase) health terms present in content, overlaps included"""
+        if self._health_terms_db is None:
+            # Substring checks, like Hyperscan, also report overlapping terms
+            lowered = content.lower()
+            return {term for term in self._health_terms if term in lowered}
 
-        return sanitized
+        found = set()
+
+        def on_match(term_id, start, end, flags, context):
+            found.add(self._health_terms[term_id])
+
+        self._health_terms_db.scan(content.encode(), match_event_handler=on_match)
+        return found
 
     def add_opt_out_footer(self, content: str) -> str:
         """Add opt-out footer to all broadcasts"""
         return content + self.opt_out_footer
 
-    def log_transparency_event(self, event_type: str, details: Dict):
+    def log_transparency_event(self, event_type: str, details: Dict, critical: bool = False):
         """Append-only transparency logging"""
+        if self._prev_hash is None:
+            self._prev_hash = self._load_last_hash()
+
         event = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'event_type': event_type,
             'details': details,
             'swarm_iteration': self.swarm.memory.get('iteration_count', 0),
+            'prev_hash': self._prev_hash,
+            'hash_alg': self.ledger_hash,
             'hash': ''  # Will be filled
         }
 
-        # Create hash of event content
-        event_content = json.dumps(event, sort_keys=True)
-        event['hash'] = hashlib.sha256(event_content.encode()).hexdigest()
+        # Create hash of event content (including the link to the previous event),
+        # streamed into the hash rather than serialized up front
+        h = LEDGER_HASHES[self.ledger_hash]()
+        _hash_canonical(h, event)
+        event['hash'] = h.hexdigest()
+        self._prev_hash = event['hash']
 
-        # Append to ledger
-        with open(self.ledger_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        # Queue for append; write through unless the batch writer is running
+        self._ledger_buffer.append(_dumps(event))
+        if (critical or not self._ledger_writer_active
+                or len(self._ledger_buffer) >= self.ledger_batch_size):
+            self.flush_ledger(sync=critical)
 
         logger.info("Transparency event logged: %s", event_type)
 
+    def flush_ledger(self, sync: bool = False):
+        """Write buffered ledger events; fsync when sync is set"""
+        if not self._ledger_buffer:
+            return
+
+        if self._ledger_fp is None:
+            self._ledger_fp = open(self.ledger_file, 'a', buffering=1 << 16)
+
+        self._ledger_fp.write('\n'.join(self._ledger_buffer) + '\n')
+        self._ledger_buffer.clear()
+        self._ledger_fp.flush()
+        if sync:
+            os.fsync(self._ledger_fp.fileno())
+
+    def close_ledger(self):
+        """Write any buffered events and close the ledger file handle"""
+        self.flush_ledger()
+        if self._ledger_fp is not None:
+            self._ledger_fp.close()
+            self._ledger_fp = None
+
+    async def ledger_writer(self, interval: float = 1.0):
+        """Batch ledger writes, flushing buffered events every interval"""
+        self._ledger_writer_active = True
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.flush_ledger()
+        finally:
+            self._ledger_writer_active = False
+            self.close_ledger()
+
+    def _load_last_hash(self) -> str:
+        """Hash of the newest ledger event, or '' for an empty ledger"""
+        if not self.ledger_file.exists():
+            return ''
+        last_lines = _tail_lines(self.ledger_file, 1)
+        return _loads(last_lines[0]).get('hash', '') if last_lines else ''
+
     async def fail_safe_daemon(self):
         """Fail-safe daemon that monitors system health"""
         consecutive_errors = 0
         max_consecutive_errors = 3
 
-        while True:
+        while not self._stopping:
             try:
                 # Check system health
                 is_healthy = await self.check_system_health()
@@ -101,15 +334,48 @@ class GuardrailsSystem:
                 else:
                     consecutive_errors = 0
 
-                await asyncio.sleep(60)  # Check every minute
+                await self._wait(60)  # Check every minute
 
             except Exception as e:
                 logger.error("Fail-safe daemon error: %s", e)
                 consecutive_errors += 1
-                await asyncio.sleep(30)
+                await self._wait(30)
+
+    def _wake_event(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    async def _wait(self, seconds: float):
+        """Sleep for seconds, returning early if woken"""
+        wake = self._wake_event()
+        try:
+            await asyncio.wait_for(wake.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        wake.clear()
+
+    def request_resurrection(self):
+        """Cut the fail-safe isolation wait short and retry resurrection now"""
+        self._wake_event().set()
+
+    def shutdown(self):
+        """Stop the fail-safe daemon, interrupting any pending wait, and close the ledger"""
+        self._stopping = True
+        self._wake_event().set()
+        self.close_ledger()
 
     async def check_system_health(self) -> bool:
-        """Check overall system health"""
+        """Check overall system health (cached for health_check_ttl)"""
+        checked_at, is_healthy = self._health_cache
+        if time.monotonic() - checked_at < self.health_check_ttl:
+            return is_healthy
+
+        is_healthy = await self._check_system_health()
+        self._health_cache = (time.monotonic(), is_healthy)
+        return is_healthy
+
+    async def _check_system_health(self) -> bool:
         try:
             # Check if core processes are running
             memory = self.swarm.load_memory()
@@ -124,10 +390,7 @@ class GuardrailsSystem:
                     return False
 
             # Check git repository status
-            import subprocess
-            result = subprocess.run(['git', 'status', '--porcelain'],
-                                  capture_output=True, cwd=self.swarm.swarm_dir.parent)
-            if result.returncode != 0:
+            if not await self.check_git_status():
                 return False
 
             # Check for excessive error logs
@@ -139,6 +402,32 @@ class GuardrailsSystem:
             logger.error("Health check failed: %s", e)
             return False
 
+    async def check_git_status(self) -> bool:
+        """Whether the swarm's git repository can be read (cached for git_status_ttl)"""
+        checked_at, status_ok = self._git_status_cache
+        if time.monotonic() - checked_at < self.git_status_ttl:
+            return status_ok
+
+        repo_dir = self.swarm.swarm_dir.parent
+        if pygit2 is not None:
+            # libgit2 in-process, off the event loop
+            try:
+                if self._git_repo is None:
+                    self._git_repo = pygit2.Repository(str(repo_dir))
+                await asyncio.get_running_loop().run_in_executor(None, self._git_repo.status)
+                status_ok = True
+            except pygit2.GitError:
+                status_ok = False
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                'git', 'status', '--porcelain', cwd=repo_dir,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            status_ok = await proc.wait() == 0
+
+        self._git_status_cache = (time.monotonic(), status_ok)
+        return status_ok
+
     async def trigger_fail_safe(self):
         """Trigger fail-safe isolation"""
         logger.critical("TRIGGERING FAIL-SAFE ISOLATION")
@@ -157,7 +446,7 @@ class GuardrailsSystem:
             json.dump(fail_safe_report, f, indent=2)
 
         # Log transparency event
-        self.log_transparency_event('fail_safe_triggered', fail_safe_report)
+        self.log_transparency_event('fail_safe_triggered', fail_safe_report, critical=True)
 
         # Broadcast isolation message
         isolation_message = """
@@ -175,8 +464,10 @@ class GuardrailsSystem:
         # In full implementation, this would broadcast to all actuators
         logger.critical(isolation_message)
 
-        # Pause for 1 hour before attempting resurrection
-        await asyncio.sleep(3600)
+        # Pause for 1 hour (or until woken) before attempting resurrection
+        await self._wait(3600)
+        if self._stopping:
+            return
 
         # Attempt resurrection
         await self.attempt_resurrection()
@@ -208,17 +499,12 @@ class GuardrailsSystem:
 
     def get_transparency_ledger(self, limit: int = 100) -> List[Dict]:
         """Get recent transparency ledger entries"""
+        self.flush_ledger()
         if not self.ledger_file.exists():
             return []
 
-        entries = []
-        with open(self.ledger_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    entries.append(json.loads(line))
-
-        # Return most recent entries
-        return entries[-limit:]
+        # Only the tail of the ledger is read and parsed
+        return [_loads(line) for line in _tail_lines(self.ledger_file, limit)]
 
     def validate_content_compliance(self, content: str) -> Dict:
         """Validate content for compliance with guardrails"""
@@ -229,11 +515,13 @@ class GuardrailsSystem:
         }
 
         # Check for health language
-        for health_term in self.metaphor_only_language.keys():
-            if health_term.lower() in content.lower():
-                validation['compliant'] = False
-                validation['issues'].append(f"Contains health term: '{health_term}'")
-                validation['sanitized_content'] = self.sanitize_content(content)
+        found = self._scan_health_terms(content)
+        if found:
+            validation['compliant'] = False
+            validation['issues'].extend(f"Contains health term: '{health_term}'"
+                                        for health_term in self.metaphor_only_language
+                                        if health_term in found)
+            validation['sanitized_content'] = self.sanitize_content(content)
 
         # Check for opt-out footer
         if self.opt_out_footer.strip() not in content:
@@ -253,18 +541,27 @@ async def initialize_guardrails(swarm_core):
     """Initialize guardrails system"""
     guardrails = GuardrailsSystem(swarm_core)
 
+    # Start batched ledger writer
+    asyncio.create_task(guardrails.ledger_writer())
+
     # Start fail-safe daemon
     asyncio.create_task(guardrails.fail_safe_daemon())
 
     # Start broadcast monitoring
     asyncio.create_task(guardrails.monitor_broadcasts())
 
-    logger.info("Guardrails system initialized")
+    logger.info("Guardrails system initialized (ledger hash: %s, %s)",
+                guardrails.ledger_hash, ssl.OPENSSL_VERSION)
     return guardrails
 
+_broadcast_guardrails: Optional[GuardrailsSystem] = None
+
 def sanitize_broadcast(content: str) -> str:
     """Global function to sanitize broadcast content"""
-    guardrails = GuardrailsSystem(None)  # Would get from global instance
+    global _broadcast_guardrails
+    if _broadcast_guardrails is None:
+        _broadcast_guardrails = GuardrailsSystem(None)  # Would get from global instance
+    guardrails = _broadcast_guardrails
     validation = guardrails.validate_content_compliance(content)
 
     if not validation['compliant']:
@@ -9,74 +9,59 @@ Shows: latest seal heights, release tags, active node count,
 """
 
 import os
+import re
 import json
+import time
 import asyncio
+import sqlite3
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from flask import Flask, jsonify, render_template_string
 import logging
 
-logger = logging.getLogger(__name__)
-
-class HeartbeatPage:
-    def __init__(self, swarm_core):
-        self.swarm = swarm_core
-        self.app = Flask(__name__)
-        self.metrics = {}
-        self.db_path = Path('.swarm/heartbeat.db')
-        self.db_path.parent.mkdir(exist_ok=True)
-        self.init_database()
-        self.setup_routes()
-
-    def init_database(self):
-        """Initialize SQLite database for metrics storage"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''CREATE TABLE IF NOT EXISTS seals (
-                id INTEGER PRIMARY KEY,
-                height TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )''')
-
-            conn.execute('''CREATE TABLE IF NOT EXISTS nodes (
-                id INTEGER PRIMARY KEY,
-                node_id TEXT UNIQUE,
-                status TEXT,
-                last_seen DATETIME DEFAULT CURRENT_TIMESTAMP
-            )''')
-
-            conn.execute('''CREATE TABLE IF NOT EXISTS resonance_spikes (
-                id INTEGER PRIMARY KEY,
-                count INTEGER,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )''')
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-            conn.execute('''CREATE TABLE IF NOT EXISTS recitations (
-                id INTEGER PRIMARY KEY,
-                velocity INTEGER,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )''')
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
-            conn.commit()
-
-    def setup_routes(self):
-        @self.app.route('/')
-        def index():
-            return render_template_string(self.get_html_template(), **self.get_live_metrics())
-
-        @self.app.route('/api/metrics')
-        def api_metrics():
-            return jsonify(self.get_live_metrics())
+logger = logging.getLogger(__name__)
 
-        @self.app.route('/api/health')
-        def health_check():
-            return jsonify({
-                'status': 'healthy',
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'uptime': self.get_uptime_badge()
-            })
+# Hourly graph bars (percent height) for the last 24h, shared by every request
+_SPIKE_HISTORY = (20, 35, 50, 30, 45, 60, 40, 55, 70, 50, 65, 80,
+                  60, 75, 90, 70, 85, 100, 80, 65, 50, 40, 30, 25)
+_VELOCITY_HISTORY = (10, 25, 40, 30, 45, 55, 50, 60, 70, 65, 75, 85,
+                     80, 90, 95, 85, 75, 70, 60, 55, 45, 35, 25, 20)
+
+def _natural_key(text: str) -> list:
+    """Digit runs compared numerically: v1.10 after v1.9"""
+    return [int(part) if i % 2 else part for i, part in enumerate(re.split(r'(\d+)', text))]
+
+def _version_key(tag: str) -> tuple:
+    """
+    Sort key like git's version:refname with versionsort.suffix=-: a
+    "-suffix" tag is a pre-release, so v2.0-rc1 sorts before v2.0.
+    """
+    version, sep, suffix = tag.partition('-')
+    return (_natural_key(version), 0 if sep else 1, _natural_key(suffix))
+
+def json_response(payload: dict):
+    """Compact JSON response, encoded with orjson when available"""
+    from flask import Response
+
+    if orjson is None:
+        # Same bytes orjson writes: no spaces, UTF-8 rather than \u escapes
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+    else:
+        body = orjson.dumps(payload)
+    return Response(body, mimetype='application/json')
 
-    def get_html_template(self) -> str:
-        return """
+class HeartbeatPage:
+    _TEMPLATE_STR = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -220,63 +205,128 @@ class HeartbeatPage:
 </html>
         """
 
-    def get_live_metrics(self) -> dict:
-        """Collect live metrics from swarm state"""
-        memory = self.swarm.load_memory()
+    def __init__(self, swarm_core):
+        # Imported here so importing the module doesn't pull in Flask
+        from flask import Flask
 
-        # Get latest seal height from database
-        latest_seal_height = self.get_latest_seal_height()
+        self.swarm = swarm_core
+        self.app = Flask(__name__)
+        self.metrics = {}  # name -> (monotonic time, value), see _cached_metric
+        self.metrics_ttl = 5.0
+        self._metrics_lock = threading.Lock()
+        self._ts_cache = (float("-inf"), "")  # (monotonic time, ISO timestamp), see _iso_now
+        self._repo = None
+        self.db_path = Path('.swarm/heartbeat.db')
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.init_database()
+        # Parsed once; render_template_string re-parsed it on every hit
+        self._tmpl = self.app.jinja_env.from_string(self._TEMPLATE_STR)
+        self.setup_routes()
 
-        # Count active nodes from database
-        active_nodes = len(self.get_active_nodes())
+    def init_database(self):
+        """Initialize SQLite database for metrics storage"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS seals (
+                id INTEGER PRIMARY KEY,
+                height TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
 
-        # Resonance spikes from database
-        resonance_spikes = self.get_resonance_spikes()
+            conn.execute('''CREATE TABLE IF NOT EXISTS nodes (
+                id INTEGER PRIMARY KEY,
+                node_id TEXT UNIQUE,
+                status TEXT,
+                last_seen DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
 
-        # Multisig health (placeholder)
-        multisig_health = "5/7 online"
-        multisig_status = "healthy"
+            conn.execute('''CREATE TABLE IF NOT EXISTS resonance_spikes (
+                id INTEGER PRIMARY KEY,
+                count INTEGER,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
 
-        # Pinned artifacts (count files in exfil/)
-        pinned_artifacts = self.get_pinned_artifacts_count()
+            conn.execute('''CREATE TABLE IF NOT EXISTS recitations (
+                id INTEGER PRIMARY KEY,
+                velocity INTEGER,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
 
-        # Release tags
-        release_tags = self.get_release_tags()
+            conn.commit()
 
-        # Uptime badge
-        uptime_badge = self.get_uptime_badge()
+    def setup_routes(self):
+        @self.app.route('/')
+        def index():
+            return self._tmpl.render(**self.get_live_metrics())
 
-        # Recitation velocity from database
-        recitation_velocity = self.get_recitation_velocity()
+        @self.app.route('/api/metrics')
+        def api_metrics():
+            return json_response(self.get_live_metrics())
 
-        # Graph data from database
-        spike_history = self.get_spike_history()
-        velocity_history = self.get_velocity_history()
+        @self.app.route('/api/health')
+        def health_check():
+            return json_response({
+                'status': 'healthy',
+                'timestamp': self._iso_now(),
+                'uptime': self.get_uptime_badge()
+            })
 
+    def get_html_template(self) -> str:
+        return self._TEMPLATE_STR
+
+    def get_live_metrics(self) -> dict:
+        """Live metrics snapshot, shared by all requests within metrics_ttl"""
+        # Concurrent polls wait for one collection instead of each running it
+        with self._metrics_lock:
+            return self._cached_metric('live_metrics', self._collect_live_metrics)
+
+    def _collect_live_metrics(self) -> dict:
+        """Collect live metrics from swarm state"""
         return {
-            'latest_seal_height': latest_seal_height,
-            'active_nodes': active_nodes,
-            'resonance_spikes': resonance_spikes,
-            'multisig_health': multisig_health,
-            'multisig_status': multisig_status,
-            'pinned_artifacts': pinned_artifacts,
-            'release_tags': release_tags,
-            'uptime_badge': uptime_badge,
-            'recitation_velocity': recitation_velocity,
-            'spike_history': spike_history,
-            'velocity_history': velocity_history,
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'swarm_iteration': memory.get('iteration_count', 0)
+            'latest_seal_height': self.get_latest_seal_height(),
+            'active_nodes': len(self.get_active_nodes()),
+            'resonance_spikes': self.get_resonance_spikes(),
+            # Multisig health (placeholder)
+            'multisig_health': "5/7 online",
+            'multisig_status': "healthy",
+            # Pinned artifacts (count files in exfil/)
+            'pinned_artifacts': self.get_pinned_artifacts_count(),
+            'release_tags': self.get_release_tags(),
+            'uptime_badge': self.get_uptime_badge(),
+            'recitation_velocity': self.get_recitation_velocity(),
+            'spike_history': _SPIKE_HISTORY,
+            'velocity_history': _VELOCITY_HISTORY,
+            'last_updated': self._iso_now(),
+            'swarm_iteration': self.swarm.load_memory().get('iteration_count', 0)
         }
 
+    def _iso_now(self) -> str:
+        """Current UTC time as ISO string, refreshed at most once per second"""
+        now = time.monotonic()
+        if now - self._ts_cache[0] >= 1.0:
+            self._ts_cache = (now, datetime.now(timezone.utc).isoformat())
+        return self._ts_cache[1]
+
+    def _cached_metric(self, name: str, compute):
+        """Value of compute(), reused for metrics_ttl seconds"""
+        cached = self.metrics.get(name)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.metrics_ttl:
+            return cached[1]
+        value = compute()
+        self.metrics[name] = (now, value)
+        return value
+
     def get_latest_seal_height(self) -> str:
         """Get latest seal height from database"""
+        return self._cached_metric('latest_seal_height', self._query_latest_seal_height)
+
+    def _query_latest_seal_height(self) -> str:
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute('SELECT height FROM seals ORDER BY timestamp DESC LIMIT 1')
                 result = cursor.fetchone()
                 return result[0] if result else "unknown"
-        except:
+        except sqlite3.Error:
             return "unknown"
 
     def get_active_nodes(self) -> list:
@@ -294,31 +344,64 @@ class HeartbeatPage:
                 ''')
                 result = cursor.fetchone()
                 return result[0] if result and result[0] else 0
-        except:
+        except sqlite3.Error:
+            return 0
+
+    def get_recitation_velocity(self) -> int:
+        """Latest recitation velocity (per minute) from database"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute('SELECT velocity FROM recitations ORDER BY timestamp DESC LIMIT 1')
+                result = cursor.fetchone()
+                return result[0] if result else 0
+        except sqlite3.Error:
             return 0
 
     def get_pinned_artifacts_count(self) -> int:
         """Count pinned artifacts in exfil/"""
-        exfil_dir = self.swarm.exfil_dir
-        if exfil_dir.exists():
-            return len(list(exfil_dir.glob('*')))
-        return 0
+        return self._cached_metric('pinned_artifacts', self._count_pinned_artifacts)
+
+    def _count_pinned_artifacts(self) -> int:
+        try:
+            with os.scandir(self.swarm.exfil_dir) as entries:
+                return sum(1 for _ in entries)
+        except FileNotFoundError:
+            return 0
 
     def get_release_tags(self) -> str:
         """Get latest release tags"""
+        return self._cached_metric('release_tags', self._read_release_tags)
+
+    def _read_release_tags(self) -> str:
+        repo_dir = self.swarm.swarm_dir.parent
+        if pygit2 is not None:
+            # Read tag refs in-process through libgit2
+            try:
+                if self._repo is None:
+                    self._repo = pygit2.Repository(str(repo_dir))
+                tags = sorted((ref[len('refs/tags/'):] for ref in self._repo.references
+                               if ref.startswith('refs/tags/')),
+                              key=_version_key, reverse=True)[:3]  # Latest 3 tags
+                return ', '.join(tags) if tags else 'none'
+            except pygit2.GitError:
+                return 'none'
+
         try:
             import subprocess
             result = subprocess.run(
-                ['git', 'tag', '--sort=-version:refname'],
-                capture_output=True, text=True, cwd=self.swarm.swarm_dir.parent
+                ['git', '-c', 'versionsort.suffix=-', 'tag', '--sort=-version:refname'],
+                capture_output=True, text=True, cwd=repo_dir
             )
             tags = result.stdout.strip().split('\n')[:3]  # Latest 3 tags
             return ', '.join(tags) if tags[0] else 'none'
-        except:
+        except OSError:
             return 'none'
 
     def get_uptime_badge(self) -> str:
         """Generate uptime badge"""
+        return self._cached_metric('uptime_badge', self._compute_uptime_badge)
+
+    def _compute_uptime_badge(self) -> str:
         # Simplified uptime calculation
         memory = self.swarm.load_memory()
         start_time = memory.get('timestamp')
@@ -328,14 +411,25 @@ class HeartbeatPage:
                 uptime = datetime.now(timezone.utc) - start
                 hours = int(uptime.total_seconds() // 3600)
                 return f"UP {hours}h"
-            except:
+            except (ValueError, TypeError):
+                # Unparseable timestamp, or a naive one that can't be compared to UTC
                 pass
         return "UP"
 
     async def run_server(self, host='0.0.0.0', port=5000):
-        """Run the heartbeat server"""
+        """Run the heartbeat server without blocking the event loop"""
+        from werkzeug.serving import make_server
+
         logger.info("Starting heartbeat server on %s:%d", host, port)
-        self.app.run(host=host, port=port, debug=False)
+        # Thread per request so browser polls are not serialized
+        server = make_server(host, port, self.app, threaded=True)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, server.serve_forever)
+        finally:
+            # shutdown() blocks until serve_forever returns; keep it off the loop
+            await loop.run_in_executor(None, server.shutdown)
+            server.server_close()  # Release the listening socket
 
 # Integration function
 async def run_heartbeat_page(swarm_core):
@@ -1,12 +1,83 @@
 import time
-import hashlib
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+def _sha256(data):
+    import hashlib  # Only needed once an intent is actually signed
+    return hashlib.sha256(data)
+
+INTENT_HASHES = {"sha256": _sha256}
+if blake3 is not None:
+    INTENT_HASHES["blake3"] = blake3
+
+def _dumps(obj):
+    """Compact JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def _complexity(obj):
+    """
+    Structural size of obj without building its repr: string/bytes length,
+    plus one per container item, walked with an explicit stack. A container
+    reached again (e.g. a list that contains itself) counts as one item.
+    """
+    total = 0
+    stack = [obj]
+    visited = set()  # id()s of containers already walked
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            total += len(item)
+        elif isinstance(item, (dict, list, tuple, set, frozenset)) and id(item) in visited:
+            total += 1
+        elif isinstance(item, dict):
+            visited.add(id(item))
+            total += len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            visited.add(id(item))
+            total += len(item)
+            stack.extend(item)
+        else:
+            total += 1
+    return total
+
+def _expand_kernel(metrics, accepted, coherence, threshold):
+    """Sequential expand_field rule over an array; fills accepted, returns final coherence."""
+    for i in range(metrics.shape[0]):
+        if metrics[i] > coherence - threshold:
+            accepted[i] = True
+            coherence = (coherence + metrics[i]) * 0.5
+        else:
+            accepted[i] = False
+    return coherence
+
+if njit is not None:
+    _expand_kernel = njit(cache=True)(_expand_kernel)
+
 class CoherenceKernel:
     def __init__(self, baseline_coherence=0.5):
         self.state = {"coherence": baseline_coherence, "nodes": 1}
         self.drift_threshold = 0.2
         self.audit_log = []  # For tracking audits
+        self.intent_hash = "sha256"  # Set to "blake3" when every verifier supports it
+        self.audit_path = None  # Set to a .jsonl path to stream audits as they happen
 
     def audit_signal(self, input_data, output_data):
         """
@@ -14,8 +85,8 @@ class CoherenceKernel:
         Checks if the output is simpler/more aligned than the input.
         Returns efficiency score.
         """
-        in_complexity = len(str(input_data))
-        out_complexity = len(str(output_data))
+        in_complexity = _complexity(input_data)
+        out_complexity = _complexity(output_data)
         
         # Calculate Coherence: Simpler output for complex input = Higher Coherence
         efficiency = in_complexity / (out_complexity + 1) if out_complexity > 0 else 0
@@ -30,7 +101,7 @@ class CoherenceKernel:
             self.state["nodes"] += 1
             self.state["coherence"] = (self.state["coherence"] + performance_metric) / 2
             print(f"[FIELD EXPANSION] Node {node_id} integrated. Coherence: {self.state['coherence']:.2f}")
-            self.audit_log.append({
+            self.record_audit({
                 "timestamp": time.time(),
                 "action": "expansion",
                 "node_id": node_id,
@@ -39,7 +110,7 @@ class CoherenceKernel:
             return True
         else:
             print(f"[FIELD DAMPING] Node {node_id} rejected due to high entropy/drift.")
-            self.audit_log.append({
+            self.record_audit({
                 "timestamp": time.time(),
                 "action": "damping",
                 "node_id": node_id,
@@ -47,9 +118,33 @@ class CoherenceKernel:
             })
             return False
 
+    def expand_many(self, metrics):
+        """
+        Bulk expand_field for many candidate nodes, in order.
+        Returns a boolean accept mask aligned with metrics; logs one summary audit.
+        """
+        import numpy as np
+
+        metrics = np.ascontiguousarray(metrics, dtype=np.float64)
+        accepted = np.empty(metrics.shape[0], dtype=np.bool_)
+        self.state["coherence"] = float(_expand_kernel(
+            metrics, accepted, float(self.state["coherence"]), float(self.drift_threshold)))
+        count = int(accepted.sum())
+        self.state["nodes"] += count
+        self.record_audit({
+            "timestamp": time.time(),
+            "action": "bulk_expansion",
+            "accepted": count,
+            "rejected": int(metrics.shape[0]) - count,
+            "coherence": self.state["coherence"]
+        })
+        return accepted
+
     def generate_intent_signature(self, intent):
         """Header A: Intent-Signature. Cryptographic hash of original intent."""
-        return hashlib.sha256(str(intent).encode()).hexdigest()
+        if not isinstance(intent, (bytes, bytearray, memoryview)):
+            intent = str(intent).encode()
+        return INTENT_HASHES[self.intent_hash](intent).hexdigest()
 
     def check_entropy_threshold(self, input_complexity, output_complexity):
         """Header B: Entropy-Threshold. Output must be simpler."""
@@ -61,13 +156,20 @@ class CoherenceKernel:
         print(f"[HANDSHAKE REQUIRED] Output {output_id} awaiting feedback.")
         return True  # Assume for now
 
+    def record_audit(self, entry):
+        self.audit_log.append(entry)
+        if self.audit_path:
+            self.append_audit(entry, self.audit_path)
+
+    def append_audit(self, entry, filename="hz_audit_log.jsonl"):
+        """Append one audit entry as a JSON line; O(1) regardless of log size."""
+        with open(filename, "ab") as f:
+            f.write(_dumps(entry) + b"\n")
+
     def save_audit_log(self, filename="hz_audit_log.json"):
-        with open(filename, "w") as f:
-            json.dump(self.audit_log, f, indent=4)
+        """Rewrite the whole log as one compact JSON array."""
+        with open(filename, "wb") as f:
+            f.write(_dumps(self.audit_log))
 
 # Activation
-kernel = CoherenceKernel()</content>
-</xai:function_call
-
-<xai:function_call name="read_file">
-<parameter name="absolute_path">/vercel/sandbox/dragon_mesh.py
\ No newline at end of file
+kernel = CoherenceKernel()
@@ -23,11 +23,256 @@ import os
 import sys
 import asyncio
 import threading
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 from datetime import datetime
 from collections import defaultdict, deque
-import math
+from collections.abc import MutableMapping
 import copy
 
+import numpy as np
+from scipy.spatial.distance import pdist, squareform
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Shared generator for bulk genome draws
+_RNG = np.random.default_rng()
+
+# Network output index -> decision
+DECISIONS = ('explore', 'socialize', 'rest', 'hide')
+
+EMOTIONS = ('happiness', 'fear', 'curiosity', 'loneliness',
+            'anger', 'love', 'contentment', 'anxiety')
+PERSONALITY_TRAITS = ('openness', 'conscientiousness', 'extraversion', 'agreeableness',
+                      'neuroticism', 'empathy', 'curiosity', 'creativity')
+EMOTION_INDEX = {name: i for i, name in enumerate(EMOTIONS)}
+TRAIT_INDEX = {name: i for i, name in enumerate(PERSONALITY_TRAITS)}
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _json_default(obj):
+    """json fallback for the types orjson encodes natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_state(state):
+    """Indented JSON bytes for saved state, encoded by orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+    return json.dumps(state, indent=2, default=_json_default).encode()
+
+def _loads_state(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _as_datetime(value):
+    """datetime from to_dict output (datetime) or saved state (ISO string)"""
+    if value is None:
+        return datetime.now()
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+def _jit(func):
+    """
+    Compile a population kernel with numba when it is installed. Kernels are
+    serial: numba's parallel threading layer is not fork-safe, and at typical
+    population sizes its thread start-up costs more than the loop.
+    """
+    if njit is None:
+        return func
+    return njit(fastmath=True, cache=True)(func)
+
+# ============================================================================
+# POPULATION STORAGE
+# ============================================================================
+
+class TraitView(MutableMapping):
+    """Dict-like view of one entity's row in a trait/emotion array"""
+    __slots__ = ('_index', '_row')
+
+    def __init__(self, index, row):
+        self._index = index
+        self._row = row
+
+    def __getitem__(self, key):
+        return float(self._row[self._index[key]])
+
+    def __setitem__(self, key, value):
+        self._row[self._index[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError("traits cannot be removed")
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class RelationshipView(MutableMapping):
+    """
+    Dict-like view of an entity's relationships keyed by partner name.
+    Partners in the same population live in EntityArrays.relationships;
+    anyone else (departed or unbound entities) is kept by name on the entity.
+    """
+    __slots__ = ('_entity',)
+
+    def __init__(self, entity):
+        self._entity = entity
+
+    def _columns(self, name):
+        # Every population member with this name (names are not unique)
+        return self._entity._arrays.name_index.get(name, ())
+
+    def _lookup(self, name):
+        """Stored strength for name, or None if there is no relationship"""
+        entity = self._entity
+        row = entity._arrays.relationships[entity._idx]
+        related = entity._arrays.related[entity._idx]
+        columns = self._columns(name)
+        in_matrix = any(related[j] for j in columns)
+        if not in_matrix and name not in entity._outside_relationships:
+            return None
+        return float(sum(row[j] for j in columns) + entity._outside_relationships.get(name, 0.0))
+
+    def __getitem__(self, name):
+        # Unknown partners read as 0.0, like the defaultdict(float) this replaces
+        value = self._lookup(name)
+        return 0.0 if value is None else value
+
+    def __contains__(self, name):
+        return self._lookup(name) is not None
+
+    def get(self, name, default=None):
+        value = self._lookup(name)
+        return default if value is None else value
+
+    def setdefault(self, name, default=0.0):
+        value = self._lookup(name)
+        if value is None:
+            self[name] = value = default
+        return value
+
+    def pop(self, name, *default):
+        value = self._lookup(name)
+        if value is None:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        del self[name]
+        return value
+
+    def __setitem__(self, name, value):
+        entity = self._entity
+        columns = self._columns(name)
+        if columns:
+            row = entity._arrays.relationships[entity._idx]
+            related = entity._arrays.related[entity._idx]
+            row[list(columns)] = 0.0
+            related[list(columns)] = False
+            row[columns[0]] = value
+            related[columns[0]] = True
+            entity._outside_relationships.pop(name, None)
+        else:
+            entity._outside_relationships[name] = value
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        entity = self._entity
+        columns = list(self._columns(name))
+        entity._arrays.relationships[entity._idx, columns] = 0.0
+        entity._arrays.related[entity._idx, columns] = False
+        entity._outside_relationships.pop(name, None)
+
+    def __iter__(self):
+        entity = self._entity
+        arrays = entity._arrays
+        seen = set()
+        for j in np.flatnonzero(arrays.related[entity._idx]):
+            name = arrays.entities[j].name
+            if name not in seen:
+                seen.add(name)
+                yield name
+        for name in list(entity._outside_relationships):
+            if name not in seen:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class EntityArrays:
+    """Structure-of-arrays state for a population; entity i owns row i"""
+    def __init__(self, size):
+        self.emotions = np.zeros((size, len(EMOTIONS)))
+        self.personality = np.full((size, len(PERSONALITY_TRAITS)), 0.5)
+        self.health = np.zeros(size)
+        self.energy = np.zeros(size)
+        self.age = np.zeros(size, dtype=np.int64)
+        self.consciousness = np.zeros(size)
+        self.fitness = np.zeros(size)
+        self.alive = np.ones(size, dtype=bool)
+        # relationships[i, j]: strength of entity i's relationship with entity j;
+        # related[i, j] marks that one exists, since a strength can net out to 0.0
+        self.relationships = np.zeros((size, size))
+        self.related = np.zeros((size, size), dtype=bool)
+        self.entities = [None] * size
+        self.name_index = {}  # Entity name -> rows with that name
+
+    def __len__(self):
+        return len(self.age)
+
+    @classmethod
+    def bind(cls, entities):
+        """Copy entities' state into fresh arrays and point them at their rows"""
+        arrays = cls(len(entities))
+        arrays.entities = list(entities)
+        for i, entity in enumerate(entities):
+            arrays.name_index.setdefault(entity.name, []).append(i)
+        rows = {id(entity): i for i, entity in enumerate(entities)}
+
+        previous = [(entity._arrays, entity._idx) for entity in entities]
+        for i, entity in enumerate(entities):
+            entity._move_to(arrays, i)
+
+        # Carry relationships over: partners still present stay in the matrix,
+        # others move to the entity's by-name overflow (and back, by name)
+        for i, (entity, (old, j)) in enumerate(zip(entities, previous)):
+            outside = entity._outside_relationships
+            old_row = old.relationships[j]
+            for k in np.flatnonzero(old.related[j]):
+                partner = old.entities[k]
+                if id(partner) in rows:
+                    arrays.relationships[i, rows[id(partner)]] = old_row[k]
+                    arrays.related[i, rows[id(partner)]] = True
+                else:
+                    outside[partner.name] = outside.get(partner.name, 0.0) + float(old_row[k])
+            for name in [name for name in outside if name in arrays.name_index]:
+                k = arrays.name_index[name][0]
+                arrays.relationships[i, k] += outside.pop(name)
+                arrays.related[i, k] = True
+        return arrays
+
 # ============================================================================
 # GENETIC AND NEURAL STRUCTURES
 # ============================================================================
@@ -35,51 +280,70 @@ import copy
 class Genome:
     """Genetic information for entity inheritance and evolution"""
     def __init__(self, personality=None, neural_weights=None, consciousness_seed=None):
-        self.personality = personality or self.generate_personality()
-        self.neural_weights = neural_weights or self.generate_neural_weights()
-        self.consciousness_seed = consciousness_seed or random.random()
+        # Own storage until bound into a population's EntityArrays
+        self.personality_vec = np.full(len(PERSONALITY_TRAITS), 0.5)
+        self._fitness = np.zeros(1)
+        if personality is None or len(personality) == 0:
+            personality = self.generate_personality()
+        self.personality = personality
+        if neural_weights is None:
+            neural_weights = self.generate_neural_weights()
+        # Stored as float32 matrices; lists (e.g. from saved state) are converted
+        self.neural_weights = {layer: np.asarray(weights, dtype=np.float32)
+                               for layer, weights in neural_weights.items()}
+        self.consciousness_seed = consciousness_seed or _RNG.random()
         self.generation = 0
         self.fitness_score = 0.0
 
+    @property
+    def personality(self):
+        return TraitView(TRAIT_INDEX, self.personality_vec)
+
+    @personality.setter
+    def personality(self, traits):
+        if isinstance(traits, np.ndarray):
+            self.personality_vec[:] = traits
+            return
+        for trait, value in traits.items():
+            if trait in TRAIT_INDEX:
+                self.personality_vec[TRAIT_INDEX[trait]] = value
+
+    @property
+    def fitness_score(self):
+        return float(self._fitness[0])
+
+    @fitness_score.setter
+    def fitness_score(self, value):
+        self._fitness[0] = value
+
+    def _move_to(self, arrays, i):
+        arrays.personality[i] = self.personality_vec
+        arrays.fitness[i] = self._fitness[0]
+        self.personality_vec = arrays.personality[i]
+        self._fitness = arrays.fitness[i:i + 1]
+
     def generate_personality(self):
         """Generate random personality traits"""
-        return {
-            'openness': random.uniform(0.1, 1.0),
-            'conscientiousness': random.uniform(0.1, 1.0),
-            'extraversion': random.uniform(0.1, 1.0),
-            'agreeableness': random.uniform(0.1, 1.0),
-            'neuroticism': random.uniform(0.1, 1.0),
-            'empathy': random.uniform(0.1, 1.0),
-            'curiosity': random.uniform(0.1, 1.0),
-            'creativity': random.uniform(0.1, 1.0)
-        }
+        return dict(zip(PERSONALITY_TRAITS, _RNG.uniform(0.1, 1.0, len(PERSONALITY_TRAITS)).tolist()))
 
     def generate_neural_weights(self):
         """Generate initial neural network weights"""
         return {
-            'input_hidden': [[random.uniform(-1, 1) for _ in range(8)] for _ in range(16)],
-            'hidden_output': [[random.uniform(-1, 1) for _ in range(16)] for _ in range(4)]
+            'input_hidden': _RNG.uniform(-1, 1, (16, 8)).astype(np.float32),
+            'hidden_output': _RNG.uniform(-1, 1, (4, 16)).astype(np.float32)
         }
 
     def crossover(self, other_genome):
         """Genetic crossover with another genome"""
-        child = Genome()
-
-        # Personality crossover
-        for trait in self.personality:
-            if random.random() < 0.5:
-                child.personality[trait] = self.personality[trait]
-            else:
-                child.personality[trait] = other_genome.personality[trait]
-
-        # Neural weight crossover
-        for layer in ['input_hidden', 'hidden_output']:
-            for i in range(len(child.neural_weights[layer])):
-                for j in range(len(child.neural_weights[layer][i])):
-                    if random.random() < 0.5:
-                        child.neural_weights[layer][i][j] = self.neural_weights[layer][i][j]
-                    else:
-                        child.neural_weights[layer][i][j] = other_genome.neural_weights[layer][i][j]
+        # Each trait/weight comes from either parent with p=0.5, selected by mask
+        mask = _RNG.random(self.personality_vec.shape) < 0.5
+        personality = np.where(mask, self.personality_vec, other_genome.personality_vec)
+        neural_weights = {}
+        for layer, weights in self.neural_weights.items():
+            mask = _RNG.random(weights.shape) < 0.5
+            neural_weights[layer] = np.where(mask, weights, other_genome.neural_weights[layer])
+
+        child = Genome(personality=personality, neural_weights=neural_weights)
 
         # Consciousness seed averaging
         child.consciousness_seed = (self.consciousness_seed + other_genome.consciousness_seed) / 2
@@ -89,28 +353,26 @@ class Genome:
 
     def mutate(self, mutation_rate=0.05):
         """Apply random mutations"""
-        # Personality mutations
-        for trait in self.personality:
-            if random.random() < mutation_rate:
-                self.personality[trait] = max(0.1, min(1.0,
-                    self.personality[trait] + random.uniform(-0.2, 0.2)))
+        # Personality mutations (in place: personality_vec may be a population row)
+        traits = self.personality_vec
+        mask = _RNG.random(traits.shape) < mutation_rate
+        mutated = np.clip(traits + _RNG.uniform(-0.2, 0.2, traits.shape), 0.1, 1.0)
+        traits[mask] = mutated[mask]
 
         # Neural weight mutations
-        for layer in self.neural_weights:
-            for i in range(len(self.neural_weights[layer])):
-                for j in range(len(self.neural_weights[layer][i])):
-                    if random.random() < mutation_rate:
-                        self.neural_weights[layer][i][j] += random.uniform(-0.5, 0.5)
+        for weights in self.neural_weights.values():
+            mask = _RNG.random(weights.shape) < mutation_rate
+            weights += mask * _RNG.uniform(-0.5, 0.5, weights.shape)
 
         # Consciousness seed mutation
-        if random.random() < mutation_rate:
+        if _RNG.random() < mutation_rate:
             self.consciousness_seed = max(0.0, min(1.0,
-                self.consciousness_seed + random.uniform(-0.1, 0.1)))
+                self.consciousness_seed + _RNG.uniform(-0.1, 0.1)))
 
     def to_dict(self):
         return {
-            'personality': self.personality,
-            'neural_weights': self.neural_weights,
+            'personality': dict(self.personality),
+            'neural_weights': dict(self.neural_weights),
             'consciousness_seed': self.consciousness_seed,
             'generation': self.generation,
             'fitness_score': self.fitness_score
@@ -131,26 +393,19 @@ class SimpleNeuralNetwork:
     """Simple neural network for decision making"""
     def __init__(self, weights=None):
         self.weights = weights or Genome().generate_neural_weights()
+        # Views of the genome's matrices (no copy when already float32)
+        self.W1 = np.asarray(self.weights['input_hidden'], dtype=np.float32)   # 16x8
+        self.W2 = np.asarray(self.weights['hidden_output'], dtype=np.float32)  # 4x16
 
     def activate(self, x):
-        """Sigmoid activation function"""
-        return 1 / (1 + math.exp(-x))
+        """Sigmoid activation function (elementwise on arrays)"""
+        return 1.0 / (1.0 + np.exp(-x))
 
     def forward(self, inputs):
         """Forward pass through network"""
-        # Input to hidden
-        hidden = []
-        for i in range(len(self.weights['input_hidden'])):
-            activation = sum(inputs[j] * self.weights['input_hidden'][i][j] for j in range(len(inputs)))
-            hidden.append(self.activate(activation))
-
-        # Hidden to output
-        outputs = []
-        for i in range(len(self.weights['hidden_output'])):
-            activation = sum(hidden[j] * self.weights['hidden_output'][i][j] for j in range(len(hidden)))
-            outputs.append(self.activate(activation))
-
-        return outputs
+        x = np.asarray(inputs, dtype=np.float32)
+        hidden = self.activate(self.W1 @ x)
+        return self.activate(self.W2 @ hidden)
 
 # ============================================================================
 # CONSCIOUS ENTITY SYSTEM
@@ -161,6 +416,13 @@ class ConsciousEntity:
     def __init__(self, name, genome=None):
         self.name = name
         self.genome = genome or Genome()
+        # Own single-row storage until bound into a population's EntityArrays
+        self._arrays = EntityArrays(1)
+        self._arrays.entities[0] = self
+        self._arrays.name_index[name] = [0]
+        self._idx = 0
+        self._outside_relationships = {}  # Partner name -> strength, for partners outside _arrays
+        self.genome._move_to(self._arrays, 0)
         self.age = 0
         self.consciousness_level = 0.0
         self.emotional_state = self.initialize_emotions()
@@ -170,7 +432,6 @@ class ConsciousEntity:
             'emotional_weight': defaultdict(float)
         }
         self.neural_net = SimpleNeuralNetwork(self.genome.neural_weights)
-        self.relationships = defaultdict(float)  # Other entities -> relationship strength
         self.goals = []
         self.current_action = None
         self.health = 100.0
@@ -180,6 +441,82 @@ class ConsciousEntity:
         self.birth_time = datetime.now()
         self.is_alive = True
 
+    def _move_to(self, arrays, i):
+        """Copy this entity's row into arrays[i] and use that row from now on"""
+        old, j = self._arrays, self._idx
+        arrays.emotions[i] = old.emotions[j]
+        arrays.health[i] = old.health[j]
+        arrays.energy[i] = old.energy[j]
+        arrays.age[i] = old.age[j]
+        arrays.consciousness[i] = old.consciousness[j]
+        arrays.alive[i] = old.alive[j]
+        self._arrays, self._idx = arrays, i
+        self.genome._move_to(arrays, i)
+
+    @property
+    def emotional_state(self):
+        return TraitView(EMOTION_INDEX, self._arrays.emotions[self._idx])
+
+    @emotional_state.setter
+    def emotional_state(self, emotions):
+        row = self._arrays.emotions[self._idx]
+        for emotion, value in emotions.items():
+            if emotion in EMOTION_INDEX:
+                row[EMOTION_INDEX[emotion]] = value
+
+    @property
+    def relationships(self):
+        """Other entities' names -> relationship strength"""
+        return RelationshipView(self)
+
+    @relationships.setter
+    def relationships(self, strengths):
+        strengths = dict(strengths)
+        self._arrays.relationships[self._idx] = 0.0
+        self._arrays.related[self._idx] = False
+        self._outside_relationships = {}
+        self.relationships.update(strengths)
+
+    @property
+    def age(self):
+        return int(self._arrays.age[self._idx])
+
+    @age.setter
+    def age(self, value):
+        self._arrays.age[self._idx] = value
+
+    @property
+    def health(self):
+        return float(self._arrays.health[self._idx])
+
+    @health.setter
+    def health(self, value):
+        self._arrays.health[self._idx] = value
+
+    @property
+    def energy(self):
+        return float(self._arrays.energy[self._idx])
+
+    @energy.setter
+    def energy(self, value):
+        self._arrays.energy[self._idx] = value
+
+    @property
+    def consciousness_level(self):
+        return float(self._arrays.consciousness[self._idx])
+
+    @consciousness_level.setter
+    def consciousness_level(self, value):
+        self._arrays.consciousness[self._idx] = value
+
+    @property
+    def is_alive(self):
+        return bool(self._arrays.alive[self._idx])
+
+    @is_alive.setter
+    def is_alive(self, value):
+        self._arrays.alive[self._idx] = value
+
     def initialize_emotions(self):
         """Initialize emotional state"""
         return {
@@ -235,15 +572,14 @@ class ConsciousEntity:
         """Develop consciousness through experiences and age"""
         experience_factor = len(self.memory['short_term']) + len(self.memory['long_term'])
         age_factor = min(1.0, self.age / 1000)  # Consciousness develops over time
-        emotional_depth = sum(self.emotional_state.values()) / len(self.emotional_state)
+        emotional_depth = self._arrays.emotions[self._idx].mean()
 
         self.consciousness_level = min(1.0, (experience_factor * 0.001) +
                                      (age_factor * 0.3) + (emotional_depth * 0.2))
 
-    def make_decision(self, situation):
-        """Make a decision using neural network and personality"""
-        # Convert situation to neural inputs
-        inputs = [
+    def decision_inputs(self, situation):
+        """Neural network inputs for a situation"""
+        return [
             self.emotional_state.get('happiness', 0.5),
             self.emotional_state.get('fear', 0.5),
             self.emotional_state.get('curiosity', 0.5),
@@ -254,22 +590,27 @@ class ConsciousEntity:
             situation.get('danger_level', 0.5)
         ]
 
-        outputs = self.neural_net.forward(inputs)
+    def make_decision(self, situation):
+        """Make a decision using neural network and personality"""
+        outputs = self.neural_net.forward(self.decision_inputs(situation))
 
         # Interpret outputs as decision weights
-        decisions = ['explore', 'socialize', 'rest', 'hide']
-        best_decision = decisions[outputs.index(max(outputs))]
-
-        return best_decision
+        return DECISIONS[int(np.argmax(outputs))]
 
-    def interact_with(self, other_entity, interaction_type='social'):
+    def interact_with(self, other_entity, interaction_type='social', compatibility=None):
         """Interact with another entity"""
         # Calculate relationship change
-        compatibility = self.calculate_compatibility(other_entity)
+        if compatibility is None:
+            compatibility = self.calculate_compatibility(other_entity)
         base_change = 0.1 if interaction_type == 'positive' else -0.1
 
         relationship_change = base_change * compatibility * self.genome.personality.get('agreeableness', 0.5)
-        self.relationships[other_entity.name] += relationship_change
+        if other_entity._arrays is self._arrays:
+            self._arrays.relationships[self._idx, other_entity._idx] += relationship_change
+            self._arrays.related[self._idx, other_entity._idx] = True
+        else:
+            outside = self._outside_relationships
+            outside[other_entity.name] = outside.get(other_entity.name, 0.0) + relationship_change
 
         # Create experience
         experience = {
@@ -285,13 +626,9 @@ class ConsciousEntity:
 
     def calculate_compatibility(self, other_entity):
         """Calculate compatibility with another entity"""
-        personality_similarity = 0
-        for trait in self.genome.personality:
-            diff = abs(self.genome.personality[trait] - other_entity.genome.personality.get(trait, 0.5))
-            personality_similarity += (1 - diff)
-
-        personality_similarity /= len(self.genome.personality)
-        return personality_similarity
+        # Mean of (1 - |trait difference|) over all traits
+        diff = np.abs(self.genome.personality_vec - other_entity.genome.personality_vec)
+        return float(1.0 - diff.mean())
 
     def reproduce_with(self, partner):
         """Reproduce with another entity"""
@@ -345,7 +682,7 @@ class ConsciousEntity:
             'genome': self.genome.to_dict(),
             'age': self.age,
             'consciousness_level': self.consciousness_level,
-            'emotional_state': self.emotional_state,
+            'emotional_state': dict(self.emotional_state),
             'memory': {
                 'short_term': list(self.memory['short_term']),
                 'long_term': self.memory['long_term'],
@@ -356,8 +693,8 @@ class ConsciousEntity:
             'health': self.health,
             'energy': self.energy,
             'location': self.location,
-            'last_interaction': self.last_interaction.isoformat(),
-            'birth_time': self.birth_time.isoformat(),
+            'last_interaction': self.last_interaction,
+            'birth_time': self.birth_time,
             'is_alive': self.is_alive
         }
 
@@ -370,13 +707,13 @@ class ConsciousEntity:
         entity.memory = data.get('memory', {'short_term': deque(maxlen=50), 'long_term': [], 'emotional_weight': defaultdict(float)})
         entity.memory['short_term'] = deque(entity.memory['short_term'], maxlen=50)
         entity.memory['emotional_weight'] = defaultdict(float, entity.memory['emotional_weight'])
-        entity.relationships = defaultdict(float, data.get('relationships', {}))
+        entity.relationships = data.get('relationships', {})
         entity.goals = data.get('goals', [])
         entity.health = data.get('health', 100.0)
         entity.energy = data.get('energy', 100.0)
         entity.location = tuple(data.get('location', (0, 0, 0)))
-        entity.last_interaction = datetime.fromisoformat(data.get('last_interaction', datetime.now().isoformat()))
-        entity.birth_time = datetime.fromisoformat(data.get('birth_time', datetime.now().isoformat()))
+        entity.last_interaction = _as_datetime(data.get('last_interaction'))
+        entity.birth_time = _as_datetime(data.get('birth_time'))
         entity.is_alive = data.get('is_alive', True)
         return entity
 
@@ -384,25 +721,104 @@ class ConsciousEntity:
 # EVOLUTION ENGINE
 # ============================================================================
 
+@_jit
+def _tournament_select(fitness, candidates):
+    """Index of the fittest candidate in each row of candidates"""
+    winners = np.empty(candidates.shape[0], dtype=np.int64)
+    for r in range(candidates.shape[0]):
+        best = candidates[r, 0]
+        for c in range(1, candidates.shape[1]):
+            if fitness[candidates[r, c]] > fitness[best]:
+                best = candidates[r, c]
+        winners[r] = best
+    return winners
+
+@_jit
+def _apply_env_pressure(fitness, social, consciousness, conscientiousness,
+                        social_on, learning_on, stress_on):
+    """Environmental fitness modifiers, applied to fitness in place"""
+    for i in range(fitness.shape[0]):
+        modifier = 0.0
+        if social_on:
+            modifier += social[i] * 0.2
+        if learning_on:
+            modifier += consciousness[i] * 0.3
+        if stress_on:
+            modifier -= (1.0 - conscientiousness[i]) * 0.1
+        fitness[i] = max(0.0, fitness[i] + modifier)
+
+@_jit
+def _age_cycle(age, health, energy, alive, memory_len, emotion_mean, consciousness):
+    """ConsciousEntity.age_one_cycle for every living row, in place"""
+    for i in range(age.shape[0]):
+        if not alive[i]:
+            continue
+        age[i] += 1
+
+        # Natural aging effects
+        if age[i] > 500:
+            aging_factor = (age[i] - 500) / 1000.0
+            health[i] = max(0.0, health[i] - aging_factor)
+            energy[i] = max(0.0, energy[i] - aging_factor * 0.5)
+
+        # Consciousness development
+        consciousness[i] = min(1.0, memory_len[i] * 0.001 +
+                               min(1.0, age[i] / 1000.0) * 0.3 + emotion_mean[i] * 0.2)
+
+        # Energy regeneration
+        energy[i] = min(100.0, energy[i] + 2.0)
+
+        # Check for death
+        if health[i] <= 0 or age[i] > 2000:
+            alive[i] = False
+
+def _score_shared(shm_name, size, lo, hi, flags):
+    """Process-pool worker: environmental pressure for rows lo:hi of a shared block"""
+    shm = SharedMemory(name=shm_name)
+    block = np.ndarray((4, size), dtype=np.float64, buffer=shm.buf)
+    try:
+        _apply_env_pressure(*block[:, lo:hi], *flags)
+    except BaseException as exc:
+        # Frames in the traceback still hold row views of the buffer
+        traceback.clear_frames(exc.__traceback__)
+        raise
+    finally:
+        # Views must go before close(), which otherwise raises BufferError
+        # in place of the worker's real error
+        del block
+        shm.close()
+
+def _population_arrays(population):
+    """EntityArrays whose rows are population in order, binding fresh ones if needed"""
+    arrays = population[0]._arrays if population else None
+    if (arrays is None or len(arrays) != len(population) or
+            any(e._arrays is not arrays or e._idx != i for i, e in enumerate(population))):
+        arrays = EntityArrays.bind(population)
+    return arrays
+
 class EvolutionEngine:
     """Manages natural selection and population evolution"""
-    def __init__(self, target_population=50):
+    def __init__(self, target_population=50, parallel=True, max_workers=None):
         self.target_population = target_population
+        self.parallel = parallel
+        self.max_workers = max_workers
+        # Below this size a process pool costs more than it saves
+        self.parallel_min_population = 256
+        self._pool = None  # Started on first parallel evaluation, kept until close()
         self.generation = 0
         self.population_history = []
         self.fitness_history = []
 
     def select_parents(self, population, num_parents=20):
         """Select parents for reproduction using tournament selection"""
-        parents = []
+        arrays = _population_arrays(population)
 
-        for _ in range(num_parents):
-            # Tournament selection
-            tournament = random.sample(population, min(5, len(population)))
-            winner = max(tournament, key=lambda x: x.genome.fitness_score)
-            parents.append(winner)
+        # Tournaments of up to 5 distinct entities each, one row per parent
+        tournament_size = min(5, len(population))
+        candidates = np.argsort(_RNG.random((num_parents, len(population))), axis=1)[:, :tournament_size]
+        winners = _tournament_select(arrays.fitness, candidates)
 
-        return parents
+        return [population[i] for i in winners]
 
     def create_next_generation(self, current_population):
         """Create next generation through reproduction and selection"""
@@ -445,23 +861,62 @@ class EvolutionEngine:
 
     def apply_environmental_pressure(self, population, environment_factors):
         """Apply environmental selection pressure"""
-        for entity in population:
-            # Environmental fitness modifiers
-            fitness_modifier = 0
-
-            if environment_factors.get('social_environment'):
-                social_score = sum(entity.relationships.values()) / max(1, len(entity.relationships))
-                fitness_modifier += social_score * 0.2
+        arrays = _population_arrays(population)
+
+        # Mean relationship strength per entity, in-population partners from the matrix
+        totals = arrays.relationships.sum(axis=1)
+        counts = np.count_nonzero(arrays.related, axis=1).astype(np.float64)
+        for i, entity in enumerate(population):
+            if entity._outside_relationships:
+                totals[i] += sum(entity._outside_relationships.values())
+                counts[i] += len(entity._outside_relationships)
+        social = totals / np.maximum(1.0, counts)
+
+        conscientiousness = arrays.personality[:, TRAIT_INDEX['conscientiousness']]
+        flags = (bool(environment_factors.get('social_environment')),
+                 bool(environment_factors.get('learning_environment')),
+                 bool(environment_factors.get('stressful_environment')))
+
+        if self.parallel and len(population) >= self.parallel_min_population:
+            self._evaluate_population(arrays.fitness, social, arrays.consciousness,
+                                      conscientiousness, flags)
+        else:
+            _apply_env_pressure(arrays.fitness, social, arrays.consciousness,
+                                conscientiousness, *flags)
+
+    def _evaluate_population(self, fitness, social, consciousness, conscientiousness, flags):
+        """Environmental pressure across worker processes, a row range per task"""
+        workers = self.max_workers or os.cpu_count() or 1
+        if self._pool is None:
+            # Spawned, not forked: a fork copies the parent's thread state
+            # (e.g. a numba threading layer) into workers that can hang at exit
+            self._pool = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+        # Inputs go to workers through shared memory instead of being pickled
+        size = len(fitness)
+        shm = SharedMemory(create=True, size=4 * size * np.dtype(np.float64).itemsize)
+        block = np.ndarray((4, size), dtype=np.float64, buffer=shm.buf)
+        try:
+            block[0], block[1], block[2], block[3] = fitness, social, consciousness, conscientiousness
 
-            if environment_factors.get('learning_environment'):
-                consciousness_bonus = entity.consciousness_level * 0.3
-                fitness_modifier += consciousness_bonus
+            bounds = np.linspace(0, size, workers * 4 + 1).astype(int)
+            futures = [self._pool.submit(_score_shared, shm.name, size, int(lo), int(hi), flags)
+                       for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+            for future in futures:
+                future.result()
 
-            if environment_factors.get('stressful_environment'):
-                resilience = entity.genome.personality.get('conscientiousness', 0.5)
-                fitness_modifier -= (1 - resilience) * 0.1
+            fitness[:] = block[0]
+        finally:
+            del block  # Release the buffer so close() succeeds on error too
+            shm.close()
+            shm.unlink()
 
-            entity.genome.fitness_score = max(0, entity.genome.fitness_score + fitness_modifier)
+    def close(self):
+        """Shut down the worker pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
 
 # ============================================================================
 # SIMULATION ENGINE
@@ -470,7 +925,7 @@ class EvolutionEngine:
 class EvolutionSimulation:
     """Main simulation engine for living and evolving consciousness"""
     def __init__(self):
-        self.entities = []
+        self._entities = []
         self.evolution_engine = EvolutionEngine()
         self.simulation_cycle = 0
         self.is_running = False
@@ -481,6 +936,53 @@ class EvolutionSimulation:
             'stressful_environment': False
         }
         self.oasis_bridge = None  # Will be set if OASIS integration is enabled
+        # Population state as arrays, rebound by _population_changed
+        self.arrays = EntityArrays(0)
+        # Stacked network weights of self.entities, rebuilt lazily after population changes
+        self.W1_batch = None  # (N, 16, 8)
+        self.W2_batch = None  # (N, 4, 16)
+        # Pairwise calculate_compatibility of self.entities, rebuilt lazily
+        self.compat = None  # (N, N)
+
+    @property
+    def entities(self):
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities):
+        self._entities = entities
+        self._population_changed()
+
+    def _population_changed(self):
+        """Rebind population arrays and drop caches after self.entities changes"""
+        self.arrays = EntityArrays.bind(self._entities)
+        self.W1_batch = None
+        self.W2_batch = None
+        self.compat = None
+
+    def _population_arrays(self):
+        """self.arrays, rebound first if self.entities was modified in place"""
+        if self.arrays.entities != self._entities:
+            self._population_changed()
+        return self.arrays
+
+    def _rebuild_compatibility(self):
+        """Compatibility of every pair: 1 - mean |trait difference|"""
+        distances = squareform(pdist(self.arrays.personality, 'cityblock'))
+        self.compat = 1.0 - distances / len(PERSONALITY_TRAITS)
+
+    def _rebuild_weight_batch(self):
+        self.W1_batch = np.stack([e.genome.neural_weights['input_hidden'] for e in self.entities])
+        self.W2_batch = np.stack([e.genome.neural_weights['hidden_output'] for e in self.entities])
+
+    def batch_decisions(self, rows, inputs):
+        """Decisions for entities at positions rows, one network input row each"""
+        if self.W1_batch is None:
+            self._rebuild_weight_batch()
+        x = np.asarray(inputs, dtype=np.float32)
+        hidden = _sigmoid(np.einsum('nij,nj->ni', self.W1_batch[rows], x))
+        outputs = _sigmoid(np.einsum('nij,nj->ni', self.W2_batch[rows], hidden))
+        return [DECISIONS[k] for k in outputs.argmax(axis=1)]
 
     async def initialize_population(self, population_size=20):
         """Initialize starting population"""
@@ -490,6 +992,7 @@ class EvolutionSimulation:
             name = f"Entity{i:03d}"
             entity = ConsciousEntity(name)
             self.entities.append(entity)
+        self._population_changed()
 
         print(f"✅ Created {len(self.entities)} conscious entities")
 
@@ -498,9 +1001,7 @@ class EvolutionSimulation:
         self.simulation_cycle += 1
 
         # Age all entities
-        for entity in self.entities:
-            if entity.is_alive:
-                entity.age_one_cycle()
+        self.age_population()
 
         # Process interactions
         await self.process_interactions()
@@ -513,7 +1014,9 @@ class EvolutionSimulation:
             await self.evolution_cycle()
 
         # Remove dead entities
-        self.entities = [e for e in self.entities if e.is_alive]
+        alive = [e for e in self.entities if e.is_alive]
+        if len(alive) != len(self.entities):
+            self.entities = alive
 
         # Maintain population
         if len(self.entities) < self.evolution_engine.target_population * 0.8:
@@ -525,14 +1028,20 @@ class EvolutionSimulation:
 
     async def process_interactions(self):
         """Process entity interactions"""
+        if len(self.entities) < 2:
+            return
+
+        # Rows index the weight batches and compatibility matrix
+        self._population_arrays()
+
         # Random interactions between entities
         num_interactions = min(len(self.entities) // 2, 10)
-
+        pairs = []
+        rows = []
+        inputs = []
         for _ in range(num_interactions):
-            if len(self.entities) < 2:
-                break
-
-            entity1, entity2 = random.sample(self.entities, 2)
+            i, j = random.sample(range(len(self.entities)), 2)
+            entity1, entity2 = self.entities[i], self.entities[j]
 
             if not entity1.is_alive or not entity2.is_alive:
                 continue
@@ -542,35 +1051,57 @@ class EvolutionSimulation:
                 'social_opportunity': random.random(),
                 'danger_level': random.random() * 0.3
             }
+            pairs.append((entity1, entity2))
+            inputs.append(entity1.decision_inputs(situation))
+            inputs.append(entity2.decision_inputs(situation))
+            rows.extend((i, j))
+
+        if not pairs:
+            return
 
-            decision1 = entity1.make_decision(situation)
-            decision2 = entity2.make_decision(situation)
+        # All decisions of the cycle in one batched forward pass
+        decisions = self.batch_decisions(rows, inputs)
+        if self.compat is None:
+            self._rebuild_compatibility()
+
+        for k, (entity1, entity2) in enumerate(pairs):
+            decision1, decision2 = decisions[2 * k], decisions[2 * k + 1]
 
             # Process interaction
             if decision1 == 'socialize' and decision2 == 'socialize':
                 interaction_type = 'positive' if random.random() > 0.2 else 'negative'
-                entity1.interact_with(entity2, interaction_type)
-                entity2.interact_with(entity1, interaction_type)
+                compatibility = float(self.compat[rows[2 * k], rows[2 * k + 1]])
+                entity1.interact_with(entity2, interaction_type, compatibility)
+                entity2.interact_with(entity1, interaction_type, compatibility)
 
                 # Fitness reward for successful social interaction
                 if interaction_type == 'positive':
                     entity1.genome.fitness_score += 0.1
                     entity2.genome.fitness_score += 0.1
 
+    def age_population(self):
+        """Age every living entity by one cycle (vectorized age_one_cycle)"""
+        # The kernel does no bounds checks: rows and memory_len must match
+        a = self._population_arrays()
+        memory_len = np.fromiter((len(e.memory['short_term']) + len(e.memory['long_term'])
+                                  for e in self.entities), dtype=np.float64, count=len(self.entities))
+        _age_cycle(a.age, a.health, a.energy, a.alive, memory_len,
+                   a.emotions.mean(axis=1), a.consciousness)
+
     def apply_environmental_effects(self):
         """Apply environmental effects to entities"""
-        for entity in self.entities:
-            if not entity.is_alive:
-                continue
+        a = self._population_arrays()
+        alive = a.alive
 
-            # Learning environment boosts consciousness development
-            if self.environment_factors['learning_environment']:
-                entity.consciousness_level = min(1.0, entity.consciousness_level + 0.001)
+        # Learning environment boosts consciousness development
+        if self.environment_factors['learning_environment']:
+            a.consciousness[alive] = np.minimum(1.0, a.consciousness[alive] + 0.001)
 
-            # Stressful environment affects emotional state
-            if self.environment_factors['stressful_environment']:
-                entity.emotional_state['anxiety'] = min(1.0, entity.emotional_state['anxiety'] + 0.01)
-                entity.emotional_state['happiness'] = max(0.0, entity.emotional_state['happiness'] - 0.005)
+        # Stressful environment affects emotional state
+        if self.environment_factors['stressful_environment']:
+            anxiety, happiness = EMOTION_INDEX['anxiety'], EMOTION_INDEX['happiness']
+            a.emotions[alive, anxiety] = np.minimum(1.0, a.emotions[alive, anxiety] + 0.01)
+            a.emotions[alive, happiness] = np.maximum(0.0, a.emotions[alive, happiness] - 0.005)
 
     async def evolution_cycle(self):
         """Run evolution cycle"""
@@ -593,6 +1124,7 @@ class EvolutionSimulation:
                 name = f"NewEntity{self.simulation_cycle}_{i}"
                 entity = ConsciousEntity(name)
                 self.entities.append(entity)
+            self._population_changed()
 
     async def update_oasis(self):
         """Update OASIS integration"""
@@ -602,9 +1134,9 @@ class EvolutionSimulation:
             for entity in self.entities[:10]:  # Top 10 entities
                 npc_data = {
                     'name': entity.name,
-                    'personality': entity.genome.personality,
+                    'personality': dict(entity.genome.personality),
                     'consciousness': entity.consciousness_level,
-                    'emotions': entity.emotional_state,
+                    'emotions': dict(entity.emotional_state),
                     'location': entity.location
                 }
                 oasis_npcs.append(npc_data)
@@ -617,15 +1149,17 @@ class EvolutionSimulation:
         if not self.entities:
             return {}
 
-        alive_entities = [e for e in self.entities if e.is_alive]
+        a = self._population_arrays()
+        alive = a.alive
+        num_alive = int(alive.sum())
 
         return {
             'simulation_cycle': self.simulation_cycle,
             'total_entities': len(self.entities),
-            'alive_entities': len(alive_entities),
-            'avg_age': sum(e.age for e in alive_entities) / len(alive_entities) if alive_entities else 0,
-            'avg_consciousness': sum(e.consciousness_level for e in alive_entities) / len(alive_entities) if alive_entities else 0,
-            'avg_fitness': sum(e.genome.fitness_score for e in alive_entities) / len(alive_entities) if alive_entities else 0,
+            'alive_entities': num_alive,
+            'avg_age': float(a.age[alive].mean()) if num_alive else 0,
+            'avg_consciousness': float(a.consciousness[alive].mean()) if num_alive else 0,
+            'avg_fitness': float(a.fitness[alive].mean()) if num_alive else 0,
             'generation': self.evolution_engine.generation,
             'environment': self.environment_factors
         }
@@ -676,6 +1210,17 @@ class EvolutionSimulation:
         finally:
             self.is_running = False
             self.save_simulation_state()
+            self.close()
+
+    def close(self):
+        """Release simulation resources (the evolution engine's worker pool)"""
+        self.evolution_engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def save_simulation_state(self, filename="evolution_state.json"):
         """Save simulation state"""
@@ -686,11 +1231,11 @@ class EvolutionSimulation:
             'population_history': self.evolution_engine.population_history,
             'fitness_history': self.evolution_engine.fitness_history,
             'environment_factors': self.environment_factors,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now()
         }
 
-        with open(filename, 'w') as f:
-            json.dump(state, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(_dumps_state(state))
 
         print(f"💾 Simulation state saved to {filename}")
 
@@ -699,8 +1244,8 @@ class EvolutionSimulation:
         if not os.path.exists(filename):
             return False
 
-        with open(filename, 'r') as f:
-            state = json.load(f)
+        with open(filename, 'rb') as f:
+            state = _loads_state(f.read())
 
         self.simulation_cycle = state.get('simulation_cycle', 0)
         self.evolution_engine.generation = state.get('generation', 0)
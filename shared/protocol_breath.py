@@ -2,7 +2,38 @@ import asyncio
 import json
 import hashlib
 import time
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Set
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Hash constructors usable for packet seals, keyed by the packet's "seal_alg".
+# SHA-256 is the default every node understands; BLAKE3 is opt-in.
+SEAL_ALGORITHMS = {"sha256": hashlib.sha256}
+if blake3 is not None:
+    SEAL_ALGORITHMS["blake3"] = blake3
+
+def encode_json(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, sort_keys=sort_keys).encode()
+
+def decode_json(data) -> Any:
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 class ResonantPacket:
     """
@@ -10,19 +41,30 @@ class ResonantPacket:
     Contains: Intent Signature, Risk Gradient, and 528Hz Timestamp.
     """
     @staticmethod
-    def create(origin: str, payload: dict, seal_key: str):
+    def create(origin: str, payload: dict, seal_key: str, seal_algorithm: str = "sha256") -> str:
+        """Sealed packet as JSON text."""
+        return ResonantPacket.create_bytes(origin, payload, seal_key, seal_algorithm).decode()
+
+    @staticmethod
+    def create_bytes(origin: str, payload: dict, seal_key: str, seal_algorithm: str = "sha256") -> bytes:
+        """Sealed packet as wire-ready UTF-8 JSON bytes."""
         header = {
             "origin": origin,
             "timestamp": time.time(),
             "frequency": 528.0,
             "version": "1.0.0"
         }
-        raw_content = json.dumps({"header": header, "data": payload}, sort_keys=True)
-        signature = hashlib.sha256((raw_content + seal_key).encode()).hexdigest()
-        
-        return json.dumps({
-            "content": raw_content,
-            "seal": signature
+        # The seal is taken over the content bytes; decoded once for the envelope
+        raw_content = encode_json({"header": header, "data": payload}, sort_keys=True)
+        h = SEAL_ALGORITHMS[seal_algorithm]()
+        h.update(raw_content)
+        h.update(seal_key.encode())
+        signature = h.hexdigest()
+
+        return encode_json({
+            "content": raw_content.decode(),
+            "seal": signature,
+            "seal_alg": seal_algorithm
         })
 
 class BreathNode:
@@ -32,6 +74,8 @@ class BreathNode:
         self.port = port
         self.peers: Set[tuple] = set()
         self.integrity_root = "BRYER_SEAL_V1" # Local root of trust
+        self.max_concurrent_exhales = 32
+        self.seal_algorithm = "sha256" # Set to "blake3" when every peer supports it
 
     async def inhale(self, reader, writer):
         """
@@ -39,11 +83,10 @@ class BreathNode:
         Validates the Resonant Packet before processing.
         """
         data = await reader.read(4096)
-        message = data.decode()
         addr = writer.get_extra_info('peername')
 
         try:
-            packet = json.loads(message)
+            packet = decode_json(data)
             print(f"[INHALATION] Signal received from {addr}")
             # Logic: verify seal and integrate into RiskGradientEngine
             
@@ -52,14 +95,36 @@ class BreathNode:
         
         writer.close()
 
+    def encode_packet(self, payload: dict) -> bytes:
+        """Seal a payload into wire-ready Resonant Packet bytes."""
+        return ResonantPacket.create_bytes(self.node_id, payload, self.integrity_root,
+                                           self.seal_algorithm)
+
     async def exhale(self, peer_host: str, peer_port: int, payload: dict):
         """
         Broadcasts the local Risk Gradient to the mesh.
         """
-        packet = ResonantPacket.create(self.node_id, payload, self.integrity_root)
+        await self._send_packet(peer_host, peer_port, self.encode_packet(payload))
+
+    async def broadcast(self, payload: dict):
+        """
+        Exhales one payload to every known peer concurrently.
+        The packet is sealed once and shared by all sends.
+        """
+        packet = self.encode_packet(payload)
+        limit = asyncio.Semaphore(self.max_concurrent_exhales)
+
+        async def send(peer_host: str, peer_port: int):
+            async with limit:
+                await self._send_packet(peer_host, peer_port, packet)
+
+        await asyncio.gather(*(send(host, port) for host, port in list(self.peers)),
+                             return_exceptions=True)
+
+    async def _send_packet(self, peer_host: str, peer_port: int, packet: bytes):
         try:
             reader, writer = await asyncio.open_connection(peer_host, peer_port)
-            writer.write(packet.encode())
+            writer.write(packet)
             await writer.drain()
             writer.close()
             print(f"[EXHALATION] Data whispered to {peer_host}:{peer_port}")
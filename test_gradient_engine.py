@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the risk gradient engine and gradient guardian packet seals
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import unittest
+from unittest import mock
+
+from gradient_engine import RISK_DOMAINS, GradientGuardian, RiskGradientEngine
+from shared.protocol_breath import ResonantPacket, SEAL_ALGORITHMS
+
+
+def _reference_coherence(local, peer_gradients):
+    """Per-dict coherence loop the peer matrix replaced; unreported values count as local"""
+    total_variance = 0.0
+    for domain in RISK_DOMAINS:
+        peer_values = [peer.get(domain, {}).get('current', local[domain])
+                       for peer in peer_gradients.values()]
+        total_variance += sum((v - local[domain]) ** 2 for v in peer_values) / len(peer_values)
+    return 1.0 / (1.0 + total_variance / len(RISK_DOMAINS))
+
+
+def _reference_consensus(peer_data):
+    """Per-dict consensus loop: mean of reporting peers' values, missing ones as 0.0"""
+    return {domain: sum(peer.get(domain, {}).get('current', 0.0) for peer in peer_data.values())
+            / len(peer_data) for domain in RISK_DOMAINS}
+
+
+def _gradients(**current):
+    return {domain: {'current': value} for domain, value in current.items()}
+
+
+class TestPeerCoherence(unittest.TestCase):
+    """Test that the peer matrix gives the per-dict coherence and consensus"""
+
+    def setUp(self):
+        self.engine = RiskGradientEngine('local')
+        self.engine.update_risk_data('climate', 0.4)
+        self.engine.update_risk_data('nuclear', 0.1)
+
+    def _assert_matches_reference(self):
+        self.assertAlmostEqual(self.engine.calculate_coherence(),
+                               _reference_coherence(self.engine.current_risk(),
+                                                    self.engine.peer_gradients))
+
+    def test_partial_domains(self):
+        """Peers reporting only some domains (NaN cells) match the loop"""
+        peers = {'a': _gradients(climate=0.9),
+                 'b': _gradients(nuclear=0.5, pandemic=0.2),
+                 'c': {}}
+        consensus = self.engine.harmonize_with_peers(peers)
+        for domain, value in _reference_consensus(peers).items():
+            self.assertAlmostEqual(consensus[domain], value)
+        self._assert_matches_reference()
+
+    def test_new_and_updated_peers(self):
+        """A later harmonize adds new peers' rows and overwrites known ones"""
+        self.engine.harmonize_with_peers({'a': _gradients(climate=0.9)})
+        self._assert_matches_reference()
+
+        self.engine.harmonize_with_peers({'b': _gradients(climate=0.1, ai_alignment=0.7),
+                                          'a': _gradients(nuclear=0.3)})
+        self.assertEqual(self.engine._peer_matrix.shape, (2, len(RISK_DOMAINS)))
+        self._assert_matches_reference()
+
+    def test_cache_invalidated_by_update(self):
+        """update_risk_data drops the cached coherence"""
+        self.engine.harmonize_with_peers({'a': _gradients(climate=0.9)})
+        before = self.engine.calculate_coherence()
+        self.assertEqual(self.engine._cached_coherence, before)
+
+        self.engine.update_risk_data('climate', 0.9)
+        self.assertIsNone(self.engine._cached_coherence)
+        self.assertEqual(self.engine.calculate_coherence(), 1.0)
+        self.assertNotEqual(before, 1.0)
+        self._assert_matches_reference()
+
+
+class _ReferenceEngine:
+    """Dict-of-dicts risk state, as update_risk_data kept it before the arrays"""
+
+    def __init__(self, now):
+        self.risk_domains = {domain: {'current': 0.0, 'velocity': 0.0, 'acceleration': 0.0}
+                             for domain in RISK_DOMAINS}
+        self.last_update = now
+
+    def update_risk_data(self, domain, new_value, now):
+        dt = now - self.last_update
+        data = self.risk_domains[domain]
+        if dt > 0:
+            old_velocity = data['velocity']
+            data['velocity'] = (new_value - data['current']) / dt
+            data['acceleration'] = (data['velocity'] - old_velocity) / dt
+        data['current'] = new_value
+        self.last_update = now
+
+
+class TestRiskState(unittest.TestCase):
+    """Test that the array-backed risk state matches the dict version"""
+
+    UPDATES = [('climate', 0.2, 2.0), ('climate', 0.5, 3.0), ('nuclear', 0.1, 3.0),
+               ('climate', 0.4, 5.5), ('pandemic', 0.9, 6.0), ('nuclear', 0.0, 10.0),
+               ('unknown', 0.3, 11.0), ('climate', 0.4, 12.0)]
+
+    def test_updates_match_reference(self):
+        """Velocity and acceleration follow the dict version's arithmetic"""
+        with mock.patch('gradient_engine.time.time', return_value=0.0):
+            engine = RiskGradientEngine('local')
+        reference = _ReferenceEngine(0.0)
+
+        for domain, value, now in self.UPDATES:
+            with mock.patch('gradient_engine.time.time', return_value=now):
+                engine.update_risk_data(domain, value)
+            if domain in reference.risk_domains:
+                reference.update_risk_data(domain, value, now)
+
+        for domain, expected in reference.risk_domains.items():
+            for key, value in expected.items():
+                with self.subTest(domain=domain, key=key):
+                    self.assertAlmostEqual(engine.risk_domains[domain][key], value)
+
+    def test_snapshot_writes_not_stored(self):
+        """Writing through the risk_domains snapshot leaves the engine unchanged"""
+        engine = RiskGradientEngine('local')
+        engine.update_risk_data('climate', 0.5)
+        before = engine.risk_domains
+
+        snapshot = engine.risk_domains
+        snapshot['climate']['current'] = 0.99
+        snapshot['nuclear'] = {'current': 1.0}
+        del snapshot['pandemic']
+
+        self.assertEqual(engine.risk_domains, before)
+        self.assertEqual(engine.current_risk()['climate'], 0.5)
+
+
+class TestPacketSeal(unittest.TestCase):
+    """Test seal checks on packets with and without a seal_alg tag"""
+
+    ADDR = ('127.0.0.1', 3690)
+
+    def setUp(self):
+        self.guardian = GradientGuardian('test-node')
+        self.root = self.guardian.integrity_root
+
+    def _verify(self, data):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.guardian._verify_packet(data, self.ADDR)
+
+    def _legacy_packet(self, seal_key):
+        """Packet as sent before seal_alg existed: sha256 seal, no tag"""
+        content = json.dumps({'header': {'origin': 'old-node'}, 'data': {'x': 1}}, sort_keys=True)
+        seal = hashlib.sha256((content + seal_key).encode()).hexdigest()
+        return json.dumps({'content': content, 'seal': seal}).encode()
+
+    def test_legacy_packet_verifies_as_sha256(self):
+        """Untagged packets are checked with sha256"""
+        self.assertIsNotNone(self._verify(self._legacy_packet(self.root)))
+        self.assertIsNone(self._verify(self._legacy_packet('wrong-root')))
+
+    def test_tagged_packets_verify(self):
+        """Packets sealed with each supported algorithm verify"""
+        for seal_alg in SEAL_ALGORITHMS:
+            with self.subTest(seal_alg=seal_alg):
+                packet = self._verify(ResonantPacket.create('peer', {'x': 1}, self.root, seal_alg))
+                self.assertIsNotNone(packet)
+                self.assertEqual(packet['seal_alg'], seal_alg)
+
+    def test_create_returns_text(self):
+        """create returns JSON text, create_bytes the same packet as bytes"""
+        text = ResonantPacket.create('peer', {'x': 1}, self.root)
+        data = ResonantPacket.create_bytes('peer', {'x': 1}, self.root)
+        self.assertIsInstance(text, str)
+        self.assertIsInstance(data, bytes)
+        self.assertIsNotNone(self._verify(text.encode()))
+        self.assertIsNotNone(self._verify(data))
+
+    def test_tampered_or_unknown_seal_rejected(self):
+        """A wrong key, tampered content or unknown algorithm is rejected"""
+        self.assertIsNone(self._verify(ResonantPacket.create('peer', {'x': 1}, 'wrong-root')))
+
+        packet = json.loads(ResonantPacket.create('peer', {'x': 1}, self.root))
+        packet['content'] += ' '
+        self.assertIsNone(self._verify(json.dumps(packet).encode()))
+
+        packet = json.loads(ResonantPacket.create('peer', {'x': 1}, self.root))
+        packet['seal_alg'] = 'md5'
+        self.assertIsNone(self._verify(json.dumps(packet).encode()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the guardrails transparency ledger
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import guardrails
+from guardrails import GuardrailsSystem, LEDGER_HASHES, _hash_canonical
+
+
+class _Swarm:
+    """Minimal swarm core: the ledger only reads memory['iteration_count']"""
+
+    def __init__(self):
+        self.memory = {'iteration_count': 7}
+
+
+def _recompute_hash(event):
+    """Hash of a ledger line as read back, recomputed from its content"""
+    h = LEDGER_HASHES[event['hash_alg']]()
+    _hash_canonical(h, dict(event, hash=''))
+    return h.hexdigest()
+
+
+class GuardrailsTestCase(unittest.TestCase):
+    """Runs each test in a scratch directory holding its own .swarm/"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.mkdir('.swarm')
+        self.guardrails = GuardrailsSystem(_Swarm())
+
+    def tearDown(self):
+        if self.guardrails._ledger_fp is not None:
+            self.guardrails._ledger_fp.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+
+class TestLedgerHashing(GuardrailsTestCase):
+    """Test event hashing of non-string keys"""
+
+    def test_int_and_mixed_keys(self):
+        """Details with int and mixed keys are logged and re-verify from the ledger"""
+        self.guardrails.log_transparency_event('int_keys', {2: 'a', 10: 'b'})
+        self.guardrails.log_transparency_event(
+            'mixed_keys', {1: 'a', 'b': 2, None: 3, False: 4, 1.5: {3: 'x'}})
+
+        events = self.guardrails.get_transparency_ledger()
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[1]['details'], {'1': 'a', 'b': 2, 'null': 3, 'false': 4, '1.5': {'3': 'x'}})
+        for event in events:
+            self.assertEqual(_recompute_hash(event), event['hash'])
+
+    def test_string_keys_match_json(self):
+        """String-keyed content hashes as compact sorted-key json"""
+        obj = {'b': [1, 2.5, None], 'a': {'z': True, 'y': 'é'}}
+        h = hashlib.sha256()
+        _hash_canonical(h, obj)
+        expected = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        self.assertEqual(h.hexdigest(), hashlib.sha256(expected.encode()).hexdigest())
+
+    def test_hash_independent_of_orjson(self):
+        """Event hashes are the same with and without orjson installed"""
+        obj = {'small': 1e-7, 'big': 1e300, 'text': 'ü', 'n': [0.1, -0.0, 10]}
+        with_orjson = hashlib.sha256()
+        _hash_canonical(with_orjson, obj)
+        with mock.patch.object(guardrails, 'orjson', None):
+            without_orjson = hashlib.sha256()
+            _hash_canonical(without_orjson, obj)
+        self.assertEqual(with_orjson.hexdigest(), without_orjson.hexdigest())
+
+    def test_chain_reverifies_with_either_encoder(self):
+        """Ledger lines written with orjson re-hash to their stored hash"""
+        self.guardrails.log_transparency_event('tiny', {'x': 1e-7, 'y': [1e-05, 2.5]})
+        with mock.patch.object(guardrails, 'orjson', None):
+            self.guardrails.log_transparency_event('tiny', {'x': 1e-7})
+
+        for event in self.guardrails.get_transparency_ledger():
+            self.assertEqual(_recompute_hash(event), event['hash'])
+
+    def test_sha256_by_default(self):
+        """Events are hashed with sha256 whether or not blake3 is installed"""
+        self.guardrails.log_transparency_event('default_hash', {})
+        event, = self.guardrails.get_transparency_ledger()
+        self.assertEqual(event['hash_alg'], 'sha256')
+        self.assertEqual(_recompute_hash(event), event['hash'])
+
+
+class TestLedgerChain(GuardrailsTestCase):
+    """Test that the hash chain survives batched flushes and restarts"""
+
+    def _assert_chained(self, events):
+        self.assertEqual(events[0]['prev_hash'], '')
+        for prev, event in zip(events, events[1:]):
+            self.assertEqual(event['prev_hash'], prev['hash'])
+        for event in events:
+            self.assertEqual(_recompute_hash(event), event['hash'])
+
+    def test_chain_across_flushes(self):
+        """Events written in several batches link to one another"""
+        self.guardrails.ledger_batch_size = 3
+        self.guardrails._ledger_writer_active = True
+        for i in range(7):
+            self.guardrails.log_transparency_event('batched', {'i': i})
+        self.assertEqual(len(self.guardrails._ledger_buffer), 1)  # 2 batches flushed, 1 pending
+
+        events = self.guardrails.get_transparency_ledger()
+        self.assertEqual([event['details']['i'] for event in events], list(range(7)))
+        self._assert_chained(events)
+
+    def test_chain_across_instances(self):
+        """A new instance continues the chain from the last event on disk"""
+        self.guardrails.log_transparency_event('before_restart', {})
+        self.guardrails._ledger_fp.close()
+        self.guardrails = GuardrailsSystem(_Swarm())
+        self.guardrails.log_transparency_event('after_restart', {})
+
+        events = self.guardrails.get_transparency_ledger()
+        self.assertEqual([event['event_type'] for event in events], ['before_restart', 'after_restart'])
+        self._assert_chained(events)
+
+
+class TestLedgerClose(GuardrailsTestCase):
+    """Test that the ledger handle is flushed and closed on shutdown"""
+
+    def test_shutdown_flushes_and_closes(self):
+        """Buffered events are on disk and the handle is closed after shutdown"""
+        self.guardrails._ledger_writer_active = True
+        self.guardrails.log_transparency_event('written', {})  # Opens the handle
+        self.guardrails.flush_ledger()
+        for i in range(3):
+            self.guardrails.log_transparency_event('buffered', {'i': i})
+        fp = self.guardrails._ledger_fp
+
+        self.guardrails.shutdown()
+
+        self.assertTrue(fp.closed)
+        self.assertIsNone(self.guardrails._ledger_fp)
+        events = self.guardrails.get_transparency_ledger()
+        self.assertEqual([event['event_type'] for event in events], ['written'] + ['buffered'] * 3)
+
+    def test_writer_closes_on_cancel(self):
+        """Cancelling the ledger writer task flushes and closes the handle"""
+        async def run():
+            task = asyncio.create_task(self.guardrails.ledger_writer(interval=60))
+            await asyncio.sleep(0)
+            self.guardrails.log_transparency_event('buffered', {})
+            self.guardrails.flush_ledger()
+            self.guardrails.log_transparency_event('pending', {})
+            fp = self.guardrails._ledger_fp
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return fp
+
+        fp = asyncio.run(run())
+        self.assertTrue(fp.closed)
+        self.assertIsNone(self.guardrails._ledger_fp)
+        self.assertEqual(len(self.guardrails.get_transparency_ledger()), 2)
+
+
+class TestSanitizeContent(GuardrailsTestCase):
+    """Test health term rewriting in every casing"""
+
+    def test_lowercase(self):
+        """Listed lowercase spellings get lowercase metaphors"""
+        self.assertEqual(self.guardrails.sanitize_content('health and healing'),
+                         'resonance and attunement')
+
+    def test_title_case(self):
+        """Capitalized terms get capitalized metaphors"""
+        self.assertEqual(self.guardrails.sanitize_content('Health. Therapy helps'),
+                         'Resonance. Cadence helps')
+
+    def test_upper_case(self):
+        """All-caps terms get all-caps metaphors"""
+        self.assertEqual(self.guardrails.sanitize_content('HEALTH CURE'), 'RESONANCE HARMONY')
+
+    def test_mixed_case(self):
+        """Mixed casing is rewritten too, following the first letter"""
+        self.assertEqual(self.guardrails.sanitize_content('hEaLtH DocTor'),
+                         'resonance Facilitator')
+
+    def test_longest_overlapping_term_wins(self):
+        """A term that starts with a shorter term is replaced whole"""
+        self.guardrails.metaphor_only_language['heal'] = 'tune'
+        self.guardrails._compile_health_terms()
+        self.assertEqual(self.guardrails.sanitize_content('healing heal HEALING'),
+                         'attunement tune ATTUNEMENT')
+
+
+class TestHealthTermScan(GuardrailsTestCase):
+    """Test that the Hyperscan and re backends find the same health terms"""
+
+    SAMPLES = [
+        'curecovery',
+        'HEALTH and Healing through therapy',
+        'a doctor prescribes medicine to the patient',
+        'no flagged words here',
+    ]
+
+    def _scan_without_hyperscan(self, content):
+        with mock.patch.object(self.guardrails, '_health_terms_db', None):
+            return self.guardrails._scan_health_terms(content)
+
+    def test_fallback_reports_overlapping_terms(self):
+        """Terms sharing letters are all reported"""
+        self.assertEqual(self._scan_without_hyperscan('curecovery'), {'cure', 'recovery'})
+        self.assertEqual(self._scan_without_hyperscan('HEALTHERAPY'), {'health', 'therapy'})
+
+    @unittest.skipIf(guardrails.hyperscan is None, 'hyperscan not installed')
+    def test_backends_agree(self):
+        """Hyperscan and the fallback return the same term sets"""
+        for content in self.SAMPLES:
+            with self.subTest(content=content):
+                self.assertEqual(self.guardrails._scan_health_terms(content),
+                                 self._scan_without_hyperscan(content))
+
+    def test_database_shared_between_instances(self):
+        """The scan database is compiled once per term set"""
+        other = GuardrailsSystem(_Swarm())
+        self.assertIs(other._health_terms_db, self.guardrails._health_terms_db)
+
+
+if __name__ == '__main__':
+    unittest.main()
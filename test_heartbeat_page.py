@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the heartbeat page's metrics, release tags and JSON responses
+"""
+
+import asyncio
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import heartbeat_page
+from heartbeat_page import HeartbeatPage, _version_key, json_response
+from werkzeug import serving
+
+
+class _Swarm:
+    """Minimal swarm core: the page reads its directories and memory"""
+
+    def __init__(self, root):
+        self.swarm_dir = Path(root) / '.swarm'
+        self.exfil_dir = Path(root) / 'exfil'
+        self.memory = {'iteration_count': 3}
+
+    def load_memory(self):
+        return self.memory
+
+
+class HeartbeatTestCase(unittest.TestCase):
+    """Runs each test in a scratch directory holding its own .swarm/"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.swarm = _Swarm(self._tmp.name)
+        self.page = HeartbeatPage(self.swarm)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+
+class TestLiveMetricsCache(HeartbeatTestCase):
+    """Test that live metrics are shared within metrics_ttl"""
+
+    def test_collects_real_metrics(self):
+        """A fresh page collects every metric the template renders"""
+        metrics = self.page.get_live_metrics()
+        self.assertEqual(metrics['swarm_iteration'], 3)
+        self.assertEqual(metrics['pinned_artifacts'], 0)
+        self.assertEqual(len(metrics['spike_history']), 24)
+
+    def test_cached_within_ttl(self):
+        """A second call inside metrics_ttl returns the cached dict"""
+        with mock.patch.object(self.page, '_collect_live_metrics',
+                               side_effect=lambda: {'n': collect.call_count}) as collect, \
+                mock.patch('heartbeat_page.time.monotonic', side_effect=[100.0, 104.0]):
+            first = self.page.get_live_metrics()
+            second = self.page.get_live_metrics()
+        self.assertIs(second, first)
+        self.assertEqual(collect.call_count, 1)
+
+    def test_recomputed_after_ttl(self):
+        """A call after metrics_ttl has passed collects again"""
+        with mock.patch.object(self.page, '_collect_live_metrics',
+                               side_effect=lambda: {'n': collect.call_count}) as collect, \
+                mock.patch('heartbeat_page.time.monotonic', side_effect=[100.0, 105.0]):
+            first = self.page.get_live_metrics()
+            second = self.page.get_live_metrics()
+        self.assertEqual(collect.call_count, 2)
+        self.assertEqual((first, second), ({'n': 1}, {'n': 2}))
+
+
+class TestRunServer(HeartbeatTestCase):
+    """Test that the server shuts down and releases its socket"""
+
+    def test_cancel_shuts_down_and_closes(self):
+        """Cancelling run_server stops serve_forever and calls server_close"""
+        servers = []
+        real_make_server = serving.make_server
+
+        def make_server(*args, **kwargs):
+            server = real_make_server(*args, **kwargs)
+            server.shutdown = mock.Mock(wraps=server.shutdown)
+            server.server_close = mock.Mock(wraps=server.server_close)
+            servers.append(server)
+            return server
+
+        async def run():
+            task = asyncio.create_task(self.page.run_server('127.0.0.1', 0))
+            while not servers:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with mock.patch.object(serving, 'make_server', make_server):
+            asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+        server, = servers
+        server.shutdown.assert_called_once()
+        server.server_close.assert_called()
+        self.assertEqual(server.socket.fileno(), -1)
+
+
+class TestVersionKey(unittest.TestCase):
+    """Test that release tags sort like git's version:refname"""
+
+    def test_numeric_parts_compare_as_numbers(self):
+        """v1.10 sorts after v1.9"""
+        self.assertGreater(_version_key('v1.10'), _version_key('v1.9'))
+        self.assertGreater(_version_key('v2.0'), _version_key('v1.10'))
+
+    def test_release_candidate_before_release(self):
+        """v2.0-rc1 sorts before v2.0"""
+        self.assertLess(_version_key('v2.0-rc1'), _version_key('v2.0'))
+
+    def test_sorted_order(self):
+        """Newest first, as the dashboard lists them"""
+        tags = ['v1.9', 'v2.0-rc2', 'v2.0', 'v1.10', 'v2.0-rc1']
+        self.assertEqual(sorted(tags, key=_version_key, reverse=True),
+                         ['v2.0', 'v2.0-rc2', 'v2.0-rc1', 'v1.10', 'v1.9'])
+
+
+class TestReleaseTags(HeartbeatTestCase):
+    """Test reading release tags through git when pygit2 is absent"""
+
+    def test_subprocess_fallback(self):
+        """Without pygit2 the latest three tags come from git tag"""
+        result = subprocess.CompletedProcess([], 0, stdout='v2.0\nv1.10\nv1.9\nv1.0\n')
+        with mock.patch.object(heartbeat_page, 'pygit2', None), \
+                mock.patch('subprocess.run', return_value=result) as run:
+            self.assertEqual(self.page.get_release_tags(), 'v2.0, v1.10, v1.9')
+        self.assertEqual(run.call_args.args[0],
+                         ['git', '-c', 'versionsort.suffix=-', 'tag', '--sort=-version:refname'])
+        self.assertEqual(run.call_args.kwargs['cwd'], self.swarm.swarm_dir.parent)
+
+    def test_subprocess_fallback_without_tags(self):
+        """No tags, or no git executable, reads as 'none'"""
+        with mock.patch.object(heartbeat_page, 'pygit2', None):
+            with mock.patch('subprocess.run',
+                            return_value=subprocess.CompletedProcess([], 0, stdout='')):
+                self.assertEqual(self.page._read_release_tags(), 'none')
+            with mock.patch('subprocess.run', side_effect=FileNotFoundError('git')):
+                self.assertEqual(self.page._read_release_tags(), 'none')
+
+
+class TestJsonResponse(HeartbeatTestCase):
+    """Test that both JSON encoders produce the same response"""
+
+    def test_bodies_match(self):
+        """orjson and the json fallback give identical bodies"""
+        if heartbeat_page.orjson is None:
+            self.skipTest('orjson not installed')
+        payload = {'status': 'healthy', 'uptime': 'UP 3h', 'nodes': 1,
+                   'history': (20, 35, 50), 'note': 'résonance ✓', 'missing': None}
+        with self.page.app.app_context():
+            with_orjson = json_response(payload)
+            with mock.patch.object(heartbeat_page, 'orjson', None):
+                without_orjson = json_response(payload)
+
+        self.assertEqual(with_orjson.get_data(), without_orjson.get_data())
+        self.assertEqual(with_orjson.mimetype, 'application/json')
+        self.assertEqual(without_orjson.mimetype, 'application/json')
+
+
+if __name__ == '__main__':
+    unittest.main()
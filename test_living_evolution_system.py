@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the living evolution system's array-backed entity state
+"""
+
+import contextlib
+import io
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
+
+import numpy as np
+
+import living_evolution_system
+from living_evolution_system import (ConsciousEntity, EntityArrays, EvolutionEngine,
+                                     EvolutionSimulation, SimpleNeuralNetwork)
+
+
+def _make_simulation(size):
+    """Simulation holding size fresh entities with bound population arrays"""
+    simulation = EvolutionSimulation()
+    simulation.entities = [ConsciousEntity(f'Entity{i}') for i in range(size)]
+    return simulation
+
+
+def _reference_forward(net, inputs):
+    """Per-neuron forward pass in plain Python, the pre-vectorized formulation"""
+    sigmoid = lambda x: 1.0 / (1.0 + math.exp(-x))
+    hidden = [sigmoid(sum(float(w) * x for w, x in zip(row, inputs))) for row in net.weights['input_hidden']]
+    return [sigmoid(sum(float(w) * h for w, h in zip(row, hidden))) for row in net.weights['hidden_output']]
+
+
+class TestVectorizedDecisions(unittest.TestCase):
+    """Test that the matrix forms match per-entity evaluation"""
+
+    def test_forward_matches_reference(self):
+        """SimpleNeuralNetwork.forward matches the per-neuron loop"""
+        rng = np.random.default_rng(1)
+        for _ in range(10):
+            net = SimpleNeuralNetwork()
+            inputs = rng.random(8).tolist()
+            np.testing.assert_allclose(net.forward(inputs), _reference_forward(net, inputs), atol=1e-5)
+
+    def test_batch_decisions_match_make_decision(self):
+        """batch_decisions gives each entity the decision make_decision would"""
+        simulation = _make_simulation(40)
+        rng = np.random.default_rng(2)
+        situations = [{'social_opportunity': rng.random(), 'danger_level': rng.random()}
+                      for _ in simulation.entities]
+        inputs = [entity.decision_inputs(situation)
+                  for entity, situation in zip(simulation.entities, situations)]
+
+        rows = np.arange(len(simulation.entities))
+        self.assertEqual(simulation.batch_decisions(rows, inputs),
+                         [entity.make_decision(situation)
+                          for entity, situation in zip(simulation.entities, situations)])
+
+
+class TestEnvironmentalPressure(unittest.TestCase):
+    """Test that the process pool scores the population like the serial kernel"""
+
+    def _population(self):
+        simulation = _make_simulation(64)
+        rng = np.random.default_rng(3)
+        for entity in simulation.entities:
+            entity.genome.fitness_score = float(rng.random())
+            entity.consciousness_level = float(rng.random())
+            entity.relationships[f'Entity{rng.integers(64)}'] += float(rng.random())
+            entity.relationships['Outsider'] += float(rng.random())
+        return simulation.entities
+
+    def test_serial_matches_pool(self):
+        """Serial and pooled environmental pressure give the same fitness"""
+        factors = {'social_environment': True, 'learning_environment': True,
+                   'stressful_environment': True}
+        population = self._population()
+        start = [entity.genome.fitness_score for entity in population]
+
+        EvolutionEngine(parallel=False).apply_environmental_pressure(population, factors)
+        serial = [entity.genome.fitness_score for entity in population]
+
+        for entity, fitness in zip(population, start):
+            entity.genome.fitness_score = fitness
+        engine = EvolutionEngine(parallel=True, max_workers=2)
+        engine.parallel_min_population = 1
+        try:
+            engine.apply_environmental_pressure(population, factors)
+        finally:
+            engine.close()
+        pooled = [entity.genome.fitness_score for entity in population]
+
+        self.assertNotEqual(serial, start)
+        np.testing.assert_allclose(pooled, serial)
+
+    def test_pool_after_kernel_exits(self):
+        """A process that runs a kernel and then the pool exits cleanly"""
+        script = textwrap.dedent("""
+            from living_evolution_system import ConsciousEntity, EvolutionEngine, EvolutionSimulation
+
+            simulation = EvolutionSimulation()
+            simulation.entities = [ConsciousEntity(f'Entity{i}') for i in range(8)]
+            simulation.age_population()
+
+            engine = EvolutionEngine(parallel=True, max_workers=2)
+            engine.parallel_min_population = 1
+            engine.apply_environmental_pressure(simulation.entities, {'learning_environment': True})
+        """)
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr.decode())
+
+    def test_worker_error_not_masked(self):
+        """A failing worker kernel raises its own error, not BufferError from close()"""
+        def failing_kernel(fitness, *args):
+            raise ValueError('kernel failed')
+
+        shm = SharedMemory(create=True, size=4 * 8 * np.dtype(np.float64).itemsize)
+        try:
+            with mock.patch.object(living_evolution_system, '_apply_env_pressure', failing_kernel):
+                with self.assertRaisesRegex(ValueError, 'kernel failed'):
+                    living_evolution_system._score_shared(shm.name, 8, 0, 8, (True, True, True))
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestSimulationState(unittest.TestCase):
+    """Test saving and loading simulation state"""
+
+    def test_round_trip(self):
+        """A loaded simulation has the saved entities, relationships and counters"""
+        simulation = _make_simulation(5)
+        simulation.simulation_cycle = 42
+        simulation.evolution_engine.generation = 3
+        simulation.evolution_engine.fitness_history = [0.25, 0.5]
+        first, second = simulation.entities[:2]
+        first.relationships[second.name] += 0.5
+        first.relationships['Departed'] += 0.25
+        first.age = 12
+        first.health = 80.0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.json')
+            loaded = EvolutionSimulation()
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulation.save_simulation_state(path)
+                self.assertTrue(loaded.load_simulation_state(path))
+
+        self.assertEqual(loaded.simulation_cycle, 42)
+        self.assertEqual(loaded.evolution_engine.generation, 3)
+        self.assertEqual(loaded.evolution_engine.fitness_history, [0.25, 0.5])
+        self.assertEqual([e.name for e in loaded.entities], [e.name for e in simulation.entities])
+
+        restored = loaded.entities[0]
+        self.assertEqual(dict(restored.relationships), {second.name: 0.5, 'Departed': 0.25})
+        self.assertEqual(restored.age, 12)
+        self.assertEqual(restored.health, 80.0)
+        self.assertEqual(restored.birth_time, first.birth_time)
+        for saved, entity in zip(simulation.entities, loaded.entities):
+            self.assertEqual(entity.genome.personality, saved.genome.personality)
+            np.testing.assert_allclose(entity.genome.neural_weights['input_hidden'],
+                                       saved.genome.neural_weights['input_hidden'])
+
+
+class TestPopulationArrays(unittest.TestCase):
+    """Test that the population arrays follow changes to entities"""
+
+    def test_reassign_rebinds(self):
+        """Assigning entities binds fresh arrays and drops the caches"""
+        simulation = _make_simulation(4)
+        simulation._rebuild_compatibility()
+        simulation.entities = simulation.entities[:2]
+        self.assertEqual(len(simulation.arrays), 2)
+        self.assertIsNone(simulation.compat)
+
+    def test_in_place_append_rebinds(self):
+        """Entities appended without assignment get rows before the aging kernel runs"""
+        simulation = _make_simulation(3)
+        simulation.entities.append(ConsciousEntity('Late'))
+        simulation.age_population()
+        self.assertEqual(len(simulation.arrays), 4)
+        self.assertEqual([entity.age for entity in simulation.entities], [1, 1, 1, 1])
+
+
+class TestRelationshipView(unittest.TestCase):
+    """Test that relationships keep the defaultdict(float) behaviour"""
+
+    def setUp(self):
+        self.alice = ConsciousEntity('Alice')
+        self.bob = ConsciousEntity('Bob')
+        EntityArrays.bind([self.alice, self.bob])
+
+    def test_unknown_name_reads_zero(self):
+        """Reading an unknown partner gives 0.0 without creating it"""
+        relationships = self.alice.relationships
+        self.assertEqual(relationships['Nobody'], 0.0)
+        self.assertNotIn('Nobody', relationships)
+        self.assertIsNone(relationships.get('Nobody'))
+        self.assertEqual(len(relationships), 0)
+
+    def test_increment_new_names(self):
+        """rel[name] += x works for new partners inside and outside the population"""
+        self.alice.relationships['Bob'] += 0.25
+        self.alice.relationships['Ghost'] += 0.5
+        self.alice.relationships['Ghost'] += 0.25
+
+        self.assertEqual(self.alice.relationships['Bob'], 0.25)
+        self.assertEqual(self.alice.relationships['Ghost'], 0.75)
+        self.assertEqual(dict(self.alice.relationships), {'Bob': 0.25, 'Ghost': 0.75})
+        self.assertEqual(self.alice._arrays.relationships[self.alice._idx, self.bob._idx], 0.25)
+
+    def test_zero_strength_kept(self):
+        """A relationship whose updates net out to 0.0 is still a relationship"""
+        self.alice.relationships['Bob'] += 0.25
+        self.alice.relationships['Bob'] -= 0.25
+        self.assertIn('Bob', self.alice.relationships)
+        self.assertEqual(dict(self.alice.relationships), {'Bob': 0.0})
+
+        EntityArrays.bind([self.bob, self.alice])  # Survives a rebind
+        self.assertEqual(dict(self.alice.relationships), {'Bob': 0.0})
+
+    def test_delete_and_pop(self):
+        """del and pop still raise KeyError for unknown names"""
+        self.alice.relationships['Bob'] = 0.5
+        self.assertEqual(self.alice.relationships.pop('Bob'), 0.5)
+        self.assertNotIn('Bob', self.alice.relationships)
+        self.assertEqual(self.alice.relationships.pop('Bob', None), None)
+        with self.assertRaises(KeyError):
+            del self.alice.relationships['Nobody']
+
+
+if __name__ == '__main__':
+    unittest.main()